@@ -0,0 +1,598 @@
+"""
+Local benchmarks for the build and collection pipeline.
+
+    python benchmark.py render --items 50000
+    python benchmark.py pages --items 2000 --page-size 50
+    python benchmark.py normalize --repeat 200
+    python benchmark.py dates --repeat 200
+    python benchmark.py pipeline --categories 8 --tools 12 --latency-ms 200 --fault-429 0.05
+"""
+import os
+import sys
+import json
+import time
+import re
+import glob
+import datetime
+import shutil
+import argparse
+import tempfile
+import threading
+import functools
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def synthetic_items(count, month="2026-01"):
+    """Builds normalized news items shaped like load_all_reports() output."""
+    tools = ["ChatGPT", "Gemini", "Claude", "Cursor", "Runway", "Notion AI", "GitHub Copilot"]
+    items = []
+    for n in range(count):
+        day = 1 + n % 28
+        minute = n % 1440
+        sort_date = f"{month}-{day:02d} {minute // 60:02d}:{minute % 60:02d}"
+        items.append({
+            "raw_date": sort_date,
+            "category": "1. Top Tier",
+            "tool": tools[n % len(tools)],
+            "summary": f"合成ベンチマーク用のニュース要約です。アップデート番号 {n} の内容を説明します。" * 2,
+            "why": "ビルド時間とメモリ使用量を測定するための合成データです。",
+            "score": 1 + n % 5,
+            "ref_url": None if n % 3 else f"https://example.com/ref/{n}",
+            "url": f"https://x.com/bench/status/{10**18 + n}",
+            "date": sort_date[:10],
+            "sort_date": sort_date,
+            "display_date": sort_date,
+        })
+    return items
+
+
+def _legacy_generate_html_from_items(items, title, tool_map):
+    """generate_html_from_items as it was before pages were streamed: one string grown with += (for comparison only)."""
+    import build_site
+
+    content_html = ""
+
+    # Determine active tab classes
+    active_latest = "active-latest" if "Latest" in title else ""
+    active_archives = "active-archives" if "Archive" in title else ""
+
+    current_date = None
+    tweet_pattern = re.compile(r'https?://(www\.)?(twitter|x)\.com/[a-zA-Z0-9_]+/status/\d+')
+
+    for item in build_site.unique_items(items):
+        # Date Header Grouping
+        if item['date'] != current_date:
+            current_date = item['date']
+            content_html += f'<h2 class="category-title">{current_date}</h2>'
+
+        accounts = tool_map.get(item['tool'], {}).get('accounts', [])
+        primary_account = accounts[0] if accounts else item['tool'].replace(" ", "")
+        search_url = f"https://x.com/search?q=from:{primary_account}&src=typed_query&f=live"
+
+        valid_url = item['url']
+        is_suspicious = False
+        if not tweet_pattern.match(valid_url):
+            is_suspicious = True
+            valid_url = search_url
+
+        ref_btn = ""
+        if item.get('ref_url'):
+            ref_btn = f"""
+                <a href="{item['ref_url']}" target="_blank" class="source-link">
+                    <i class="fas fa-external-link-alt"></i> 参照資料
+                </a>
+            """
+
+        card_buttons = f"""
+            <div class="news-footer">
+                <a href="{valid_url}" target="_blank" class="source-link">
+                    <i class="fab fa-x-twitter"></i> { '投稿を見る' if not is_suspicious else '⚠️ 検索結果' }
+                </a>
+                {ref_btn}
+            </div>
+        """
+
+        score = int(item.get('score', 3))
+        impact_class = ""
+        stars = ""
+        if score >= 5:
+            impact_class = "groundbreaking"
+            stars = f'<span class="importance-badge score-5-tag"><i class="fas fa-bolt"></i> MAJOR</span>'
+        elif score >= 4:
+            impact_class = "high-impact"
+            stars = f'<span class="importance-badge score-4-tag"><i class="fas fa-fire"></i> PICK UP</span>'
+
+        card = f"""
+        <div class="news-card {impact_class}">
+            <div class="news-header">
+                <div class="tool-name">
+                    <span class="name">{item['tool']}</span>
+                    {stars}
+                </div>
+                <div class="post-date">
+                    <i class="far fa-clock"></i> {item['display_date']}
+                </div>
+            </div>
+            <div class="news-content">
+                <p><strong>{item['summary']}</strong></p>
+                <div class="why-section">
+                    <i class="fas fa-info-circle"></i> {item['why']}
+                </div>
+            </div>
+            {card_buttons}
+        </div>
+        """
+        content_html += card
+
+    if not content_html:
+        content_html = "<div class='no-news'>期間内のニュースは見つかりませんでした。</div>"
+
+    header_html = ""
+    if "Latest" not in title:
+        header_html = f'<div style="text-align:center; margin-bottom:40px;"><h2 class="category-title">{title}</h2></div>'
+
+    return build_site.HTML_HEADER.format(active_latest=active_latest, active_archives=active_archives, active_search="",
+                                         stylesheet=build_site.site_assets.stylesheet_name()) \
+        + header_html + content_html + build_site.HTML_FOOTER
+
+
+def _render_child(path, count):
+    """Renders one synthetic month with the given path and prints JSON stats."""
+    import build_site
+    from build_cache import write_if_changed, write_stream_if_changed
+
+    items = synthetic_items(count)
+    rss_before = peak_rss_kb()
+    out = os.path.join(tempfile.mkdtemp(prefix="bench_render_"), "archive_bench.html")
+
+    start = time.perf_counter()
+    if path == "old":
+        # Whole page materialized as one string, then written
+        write_if_changed(out, _legacy_generate_html_from_items(items, "Archive: bench", {}))
+    else:
+        write_stream_if_changed(out, build_site.iter_html_from_items(items, "Archive: bench", {}))
+    seconds = time.perf_counter() - start
+
+    rss_after = peak_rss_kb()
+    print(json.dumps({
+        "path": path,
+        "seconds": seconds,
+        "bytes": os.path.getsize(out),
+        "peak_rss_kb": rss_after,
+        "render_rss_kb": None if rss_before is None else rss_after - rss_before,
+    }))
+    os.remove(out)
+
+
+def bench_render(args):
+    """Old (single string) vs new (streamed) page rendering, each in a fresh process."""
+    print(f"Rendering a synthetic month with {args.items} items...")
+    results = []
+    for path in ("old", "new"):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "render", "--child", path, "--items", str(args.items)],
+            capture_output=True, text=True, encoding="utf-8", cwd=BASE_DIR,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr)
+            sys.exit(1)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{'path':<6} {'time (s)':>9} {'page (KB)':>10} {'peak RSS (KB)':>14} {'render RSS (KB)':>16}")
+    for r in results:
+        print(f"{r['path']:<6} {r['seconds']:>9.2f} {r['bytes'] // 1024:>10} "
+              f"{r['peak_rss_kb'] or '-':>14} {r['render_rss_kb'] if r['render_rss_kb'] is not None else '-':>16}")
+
+
+def bench_pages(args):
+    """Archive pagination on a synthetic month: page weight and build time, cold and after one new item."""
+    import io
+    import contextlib
+    import build_site
+    from build_cache import PageDependencies
+
+    def build_month(docs_dir, deps, items, page_size):
+        """Renders every page of the month; returns [(file, cards, bytes, seconds)] for rendered pages."""
+        pages = build_site.plan_archive_pages("2026-01", build_site.unique_items(list(items)), page_size)
+        rendered = []
+        for page in pages:
+            before = deps.rendered
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_site.render_archive_page(deps, "bench", {}, "2026-01", page, docs_dir)
+            seconds = time.perf_counter() - start
+            if deps.rendered > before:
+                path = os.path.join(docs_dir, page['file'])
+                rendered.append((page['file'], len(page['items']), os.path.getsize(path), seconds))
+        return pages, rendered
+
+    def full_page_files(workdir, pages):
+        """(bytes, mtime) of the month's fixed _p{k} pages."""
+        return {p['file']: (open(os.path.join(workdir, p['file']), 'rb').read(),
+                            os.stat(os.path.join(workdir, p['file'])).st_mtime_ns)
+                for p in pages if "_p" in p['file']}
+
+    items = synthetic_items(args.items)
+    # Newer than every synthetic item (they span days 1-28)
+    newer = dict(items[0], url="https://x.com/bench/status/1", sort_date="2026-01-29 00:00", date="2026-01-29")
+
+    failures = []
+    for label, page_size in (("single page", 10 ** 9), (f"{args.page_size} per page", args.page_size)):
+        workdir = tempfile.mkdtemp(prefix="bench_pages_")
+        deps = PageDependencies(path=os.path.join(workdir, "page_deps.json"))
+        pages, cold = build_month(workdir, deps, items, page_size)
+        full_before = full_page_files(workdir, pages)
+        warm_pages, warm = build_month(workdir, deps, items + [newer], page_size)
+        full_after = full_page_files(workdir, warm_pages)
+        with open(os.path.join(workdir, warm_pages[0]['file']), encoding='utf-8') as f:
+            landing_has_pager = 'class="archive-pager"' in f.read()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+        checked = None
+        if page_size < args.items:
+            # A month larger than the page size: split, with a pager, and a new item leaves the full pages alone
+            if len(pages) < 2 or not landing_has_pager:
+                failures.append(f"{label}: expected a split month with a pager, got {len(pages)} page(s)")
+            rewritten = sorted(f for f in full_before if full_after.get(f) != full_before[f])
+            rerendered = sorted(f for f, *_ in warm if f in full_before)
+            if rewritten or rerendered:
+                failures.append(f"{label}: full pages changed by one new item: {', '.join(rewritten or rerendered)}")
+            else:
+                checked = f"  ✅ {len(full_before)} full _p page(s) untouched by the new item"
+
+        sizes = sorted(size for _, _, size, _ in cold)
+        print(f"\n{label}: {len(pages)} page(s) for {args.items} items")
+        print(f"  cold build: {sum(s for *_, s in cold) * 1000:.0f} ms total, "
+              f"{sum(s for *_, s in cold) / len(cold) * 1000:.1f} ms/page, "
+              f"page weight median {sizes[len(sizes) // 2] // 1024} KB / max {sizes[-1] // 1024} KB")
+        print(f"  +1 new item: {len(warm)} page(s) re-rendered in {sum(s for *_, s in warm) * 1000:.1f} ms "
+              f"({', '.join(f for f, *_ in warm)})")
+        if checked:
+            print(checked)
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+def _legacy_clean_summary_text(text, url=None, date=None):
+    """clean_summary_text as it was in build_site.py before normalize.py (for comparison only)."""
+    embedded_urls = re.findall(r'https?://\S+', text)
+    summary_lines = []
+    for line in text.split('\n'):
+        clean_line = line.strip()
+        clean_line = re.sub(r'^(?:- )?(?:Post|Time|URL|\*\*Date\*\*|\*\*Summary\*\*|\*\*URL\*\*):', '', clean_line, flags=re.IGNORECASE).strip()
+        if clean_line:
+            if (url and clean_line == url) or (date and clean_line == date):
+                continue
+            clean_line = re.sub(r'\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2})?', '', clean_line).strip()
+            clean_line = re.sub(r'https?://\S+', '', clean_line).strip()
+            if clean_line:
+                summary_lines.append(clean_line)
+    summary = " ".join(summary_lines).strip()
+    summary = summary.replace("**", "").strip()
+    summary = summary.replace("\n", " ").replace("  ", " ")
+    return summary, embedded_urls
+
+
+def bench_normalize(args):
+    """Summary normalization over the reports/ corpus: legacy vs precompiled vs memoized."""
+    import normalize
+
+    from report_store import ReportStore
+
+    corpus = [(data.get('summary', ''), data.get('url', '#'), data.get('post_date', 'Unknown Date'))
+              for _, _, data in ReportStore().iter_reports()]
+    if not corpus:
+        print("No reports found.")
+        return
+
+    mismatches = 0
+    for text, url, date in corpus:
+        summary, urls = _legacy_clean_summary_text(text, url, date)
+        if normalize.clean_summary_text(text, url, date) != (summary, tuple(urls)):
+            mismatches += 1
+
+    def run(fn, clear=False):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            if clear:
+                normalize.clean_summary_text.cache_clear()
+            for text, url, date in corpus:
+                fn(text, url, date)
+        return time.perf_counter() - start
+
+    calls = len(corpus) * args.repeat
+    results = [
+        ("legacy", run(_legacy_clean_summary_text)),
+        ("precompiled", run(normalize.clean_summary_text, clear=True)),
+        ("memoized", run(normalize.clean_summary_text)),
+    ]
+    print(f"{len(corpus)} summaries x {args.repeat} passes ({mismatches} output mismatches vs legacy)")
+    print(f"{'path':<12} {'total (s)':>10} {'per item (us)':>14} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:<12} {seconds:>10.3f} {seconds / calls * 1e6:>14.2f} {results[0][1] / seconds:>7.1f}x")
+
+
+def _legacy_process_item_date(date_raw):
+    """process_item_date as it was in build_site.py before the fast path (for comparison only)."""
+    from dateutil import parser
+    display_date = date_raw
+    sort_date = date_raw
+    item_date = "Unknown Date"
+    try:
+        clean_date = re.sub(r'\(?(GMT|UTC|JST)\)?', '', date_raw).strip()
+        dt = parser.parse(clean_date)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        dt_jst = dt.astimezone(datetime.timezone(datetime.timedelta(hours=9)))
+        display_date = dt_jst.strftime("%Y年%m月%d日 %H時%M分")
+        sort_date = dt_jst.strftime("%Y-%m-%d %H:%M")
+        item_date = dt_jst.strftime("%Y-%m-%d")
+    except (ValueError, TypeError, OverflowError):
+        match = re.search(r'(\d{4}-\d{2}-\d{2})', date_raw)
+        if match:
+            item_date = match.group(1)
+        elif date_raw != "Unknown Date" and len(date_raw) >= 10:
+            item_date = date_raw[:10]
+    return {"date": item_date, "sort_date": sort_date, "display_date": display_date}
+
+
+def bench_dates(args):
+    """post_date normalization per item: dateutil vs fast path vs memoized vs stored post_date_jst."""
+    import normalize
+
+    from report_store import ReportStore
+
+    raws = [data.get('post_date', 'Unknown Date') for _, _, data in ReportStore().iter_reports()]
+    if not raws:
+        print("No reports found.")
+        return
+    stored = [normalize.post_date_jst(raw) for raw in raws]
+
+    mismatches = sum(
+        1 for raw, iso in zip(raws, stored)
+        if tuple(_legacy_process_item_date(raw).values()) != normalize.normalize_post_date(raw, iso)
+    )
+
+    def clear():
+        normalize.parse_post_date.cache_clear()
+        normalize.normalize_post_date.cache_clear()
+
+    def run(fn, memoized=False):
+        clear()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            if not memoized:
+                clear()
+            for raw, iso in zip(raws, stored):
+                fn(raw, iso)
+        return time.perf_counter() - start
+
+    calls = len(raws) * args.repeat
+    results = [
+        ("dateutil", run(lambda raw, iso: _legacy_process_item_date(raw))),
+        ("fast path", run(lambda raw, iso: normalize.normalize_post_date(raw))),
+        ("stored jst", run(lambda raw, iso: normalize.normalize_post_date(raw, iso))),
+        ("memoized", run(lambda raw, iso: normalize.normalize_post_date(raw, iso), memoized=True)),
+    ]
+    print(f"{len(raws)} post dates x {args.repeat} passes ({mismatches} output mismatches vs dateutil)")
+    print(f"{'path':<11} {'total (s)':>10} {'per item (us)':>14} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:<11} {seconds:>10.3f} {seconds / calls * 1e6:>14.2f} {results[0][1] / seconds:>7.1f}x")
+
+
+def synthetic_targets(categories, tools):
+    """targets.json with `categories` categories of `tools` tools (one or two accounts each)."""
+    config = []
+    for c in range(categories):
+        config.append({
+            "category": f"{c + 1}. Bench Category {c + 1}",
+            "tools": [
+                {"name": f"Bench Tool {c + 1}-{t + 1}",
+                 "accounts": [f"@bench_c{c + 1}_t{t + 1}"] + ([f"@bench_c{c + 1}_t{t + 1}_dev"] if t % 4 == 3 else [])}
+                for t in range(tools)
+            ],
+        })
+    return config
+
+
+def percentiles(values):
+    """Nearest-rank p50/p90/p99/max of a list of seconds."""
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+    pick = lambda q: values[min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))]
+    return {"count": len(values), "p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": values[-1]}
+
+
+class StageTimer:
+    """Records call durations per pipeline stage by wrapping module attributes."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, owner, name, stage):
+        original = getattr(owner, name)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.samples.setdefault(stage, []).append(elapsed)
+
+        setattr(owner, name, timed)
+
+
+def _pipeline_child():
+    """Runs collect -> post -> build in replay mode inside the scratch copy; prints JSON stats."""
+    import replay
+    import build_site
+    import delivery
+    import post_to_x
+    import gemini_x_filter
+    import collect_ai_news
+
+    timer = StageTimer()
+    timer.wrap(collect_ai_news, "process_category", "category")
+    timer.wrap(collect_ai_news, "search_shard", "xai_search")
+    timer.wrap(gemini_x_filter, "_generate_json", "gemini")
+    timer.wrap(replay.FakeXClient, "create_tweet", "x_post")
+    timer.wrap(build_site, "build", "build")
+    timer.wrap(delivery, "git_sync", "git")
+
+    start = time.perf_counter()
+    collect_ai_news.main()
+    collected = time.perf_counter()
+    post_to_x.main()
+    build_site.build()
+    wall = time.perf_counter() - start
+
+    xai = collect_ai_news._xai_client
+    print("BENCH_RESULT " + json.dumps({
+        "wall_s": wall,
+        "collect_s": collected - start,
+        "stages": {stage: percentiles(values) for stage, values in timer.samples.items()},
+        "calls": {"xai": replay.xai_requests(), **replay.CALLS},
+        "xai_retries": xai.retries if xai else 0,
+        "rate_limit_wait_s": collect_ai_news.XAI_BUCKET.waited,
+        "injected": replay.faults().injected,
+        "gemini_cache": gemini_x_filter.get_cache_stats(),
+        "reports": sum(1 for _ in collect_ai_news.REPORT_STORE.iter_reports()),
+        "peak_rss_kb": peak_rss_kb(),
+    }))
+
+
+def bench_pipeline(args):
+    """Full pipeline on a synthetic targets.json, in a scratch copy of the repo with replayed APIs."""
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    for path in glob.glob(os.path.join(BASE_DIR, "*.py")):
+        shutil.copy2(path, workdir)
+    if os.path.isdir(os.path.join(BASE_DIR, "fixtures")):
+        shutil.copytree(os.path.join(BASE_DIR, "fixtures"), os.path.join(workdir, "fixtures"))
+    os.makedirs(os.path.join(workdir, "docs"))
+    shutil.copy2(os.path.join(BASE_DIR, "docs", "styles.css"), os.path.join(workdir, "docs"))
+    with open(os.path.join(workdir, "targets.json"), 'w', encoding='utf-8') as f:
+        json.dump(synthetic_targets(args.categories, args.tools), f, ensure_ascii=False, indent=2)
+
+    env = dict(os.environ)
+    env.update({
+        "AI_NEWS_REPLAY": "1",
+        "REPLAY_LATENCY_MS": str(args.latency_ms),
+        "REPLAY_JITTER_MS": str(args.jitter_ms),
+        "REPLAY_FAULT_429": str(args.fault_429),
+        "REPLAY_FAULT_500": str(args.fault_500),
+        "REPLAY_SEED": str(args.seed),
+        "COLLECT_MODE": args.mode,
+        "COLLECT_CONCURRENCY": str(args.concurrency),
+        "XAI_RATE_PER_MIN": str(args.xai_rate),
+        "DELIVERY_DEBOUNCE_SEC": "0",
+        "PYTHONIOENCODING": "utf-8",
+    })
+    print(f"Pipeline: {args.categories} categories x {args.tools} tools, {args.mode} "
+          f"(latency {args.latency_ms:g}ms, 429 {args.fault_429:.0%}, 500 {args.fault_500:.0%}) in {workdir}")
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.join(workdir, "benchmark.py"), "pipeline", "--child"],
+            capture_output=True, text=True, encoding="utf-8", cwd=workdir, env=env,
+        )
+        result_lines = [line for line in proc.stdout.splitlines() if line.startswith("BENCH_RESULT ")]
+        if proc.returncode != 0 or not result_lines:
+            print(proc.stdout[-4000:])
+            print(proc.stderr[-4000:])
+            sys.exit(1)
+        if args.verbose:
+            print(proc.stdout)
+        r = json.loads(result_lines[-1][len("BENCH_RESULT "):])
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\nWall time: {r['wall_s']:.2f}s (collection {r['collect_s']:.2f}s, "
+          f"rate-limit wait {r['rate_limit_wait_s']:.2f}s)")
+    print(f"Reports written: {r['reports']}   Peak RSS: {r['peak_rss_kb'] or '-'} KB")
+    print(f"API calls: xAI {r['calls']['xai']} ({r['xai_retries']} retries), "
+          f"Gemini {r['calls']['gemini']}, X {r['calls']['x']}   "
+          f"injected 429: {r['injected']['429']}, 500: {r['injected']['500']}")
+    print(f"\n{'stage':<12} {'calls':>6} {'p50 (ms)':>9} {'p90 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for stage in ("category", "xai_search", "gemini", "x_post", "build", "git"):
+        s = r['stages'].get(stage)
+        if not s:
+            continue
+        print(f"{stage:<12} {s['count']:>6} {s['p50'] * 1000:>9.1f} {s['p90'] * 1000:>9.1f} "
+              f"{s['p99'] * 1000:>9.1f} {s['max'] * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI TOOL NEWS benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser("render", help="page rendering: whole-string vs streamed")
+    render.add_argument("--items", type=int, default=50000)
+    render.add_argument("--child", choices=["old", "new"], help=argparse.SUPPRESS)
+
+    pages = sub.add_parser("pages", help="archive pagination: page weight and (incremental) build time")
+    pages.add_argument("--items", type=int, default=2000)
+    pages.add_argument("--page-size", type=int, default=50)
+
+    norm = sub.add_parser("normalize", help="summary cleanup on the reports/ corpus: legacy vs shared normalizer")
+    norm.add_argument("--repeat", type=int, default=200)
+
+    dates = sub.add_parser("dates", help="post_date normalization: dateutil vs fast path vs memoized")
+    dates.add_argument("--repeat", type=int, default=200)
+
+    pipeline = sub.add_parser("pipeline", help="collect -> post -> build end to end with replayed APIs")
+    pipeline.add_argument("--categories", type=int, default=8)
+    pipeline.add_argument("--tools", type=int, default=8, help="tools per category")
+    pipeline.add_argument("--mode", choices=["parallel", "sequential"], default="parallel")
+    pipeline.add_argument("--concurrency", type=int, default=3)
+    pipeline.add_argument("--xai-rate", type=float, default=600, help="xAI requests per minute")
+    pipeline.add_argument("--latency-ms", type=float, default=100)
+    pipeline.add_argument("--jitter-ms", type=float, default=0)
+    pipeline.add_argument("--fault-429", type=float, default=0.0, help="share of calls answered with 429")
+    pipeline.add_argument("--fault-500", type=float, default=0.0, help="share of calls answered with 500")
+    pipeline.add_argument("--seed", type=int, default=1)
+    pipeline.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    pipeline.add_argument("--verbose", action="store_true", help="print the pipeline's own output")
+    pipeline.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.command == "render":
+        if args.child:
+            _render_child(args.child, args.items)
+        else:
+            bench_render(args)
+    elif args.command == "pages":
+        bench_pages(args)
+    elif args.command == "normalize":
+        bench_normalize(args)
+    elif args.command == "dates":
+        bench_dates(args)
+    elif args.command == "pipeline":
+        if args.child:
+            _pipeline_child()
+        else:
+            bench_pipeline(args)
+
+
+if __name__ == "__main__":
+    main()
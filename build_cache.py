@@ -0,0 +1,186 @@
+import os
+import json
+import hashlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+REPORT_CACHE_FILE = os.path.join(CACHE_DIR, "build_reports.jsonl")
+
+
+def write_atomic(path, text):
+    """Writes text to a temp file next to `path` and renames it into place."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ReportCache:
+    """
+    Parsed-report cache for the site builder (JSON-lines manifest).
+    Entries are keyed by report path and validated by size + sha256 of the file's bytes
+    (a fresh checkout resets every mtime); the whole file is discarded when the
+    normalization fingerprint changes.
+    """
+
+    def __init__(self, fingerprint, root, path=REPORT_CACHE_FILE):
+        self.fingerprint = fingerprint
+        self.root = root
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._digests = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("fingerprint") != self.fingerprint:
+                    print("  ♻️ Build cache invalidated (normalizer changed).")
+                    self.dirty = True
+                    return
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries[entry["path"]] = entry
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️ Build cache unreadable, starting fresh: {e}")
+            self.entries = {}
+            self.dirty = True
+
+    def _digest(self, rel_path):
+        if rel_path not in self._digests:
+            self._digests[rel_path] = _file_digest(os.path.join(self.root, rel_path))
+        return self._digests[rel_path]
+
+    def get(self, rel_path, stat):
+        """Returns the cached items for an unchanged file, or None."""
+        entry = self.entries.get(rel_path)
+        # Size first: a changed length is a miss without reading the file
+        if entry and entry["size"] == stat.st_size and entry.get("sha") == self._digest(rel_path):
+            self.hits += 1
+            return entry["items"]
+        self.misses += 1
+        return None
+
+    def put(self, rel_path, stat, items):
+        self.entries[rel_path] = {
+            "path": rel_path,
+            "size": stat.st_size,
+            "sha": self._digest(rel_path),
+            "items": items,
+        }
+        self.dirty = True
+
+    def prune(self, live_paths):
+        """Drops entries for reports that no longer exist."""
+        stale = set(self.entries) - set(live_paths)
+        for rel_path in stale:
+            del self.entries[rel_path]
+        if stale:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        lines = [json.dumps({"fingerprint": self.fingerprint})]
+        for rel_path in sorted(self.entries):
+            lines.append(json.dumps(self.entries[rel_path], ensure_ascii=False, separators=(',', ':')))
+        write_atomic(self.path, "\n".join(lines) + "\n")
+        self.dirty = False
+
+
+# Tracked next to the pages it describes, so it is committed with them and every
+# fresh checkout knows which pages are up to date
+PAGE_DEPS_FILE = os.path.join(BASE_DIR, "docs", "page_deps.json")
+
+
+def content_hash(*parts):
+    """Stable hash of JSON-serializable build inputs."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def write_stream_if_changed(path, fragments):
+    """
+    Streams text fragments into a temp file next to `path` and renames it into place.
+    The rename is skipped when the new bytes equal the existing file. Returns True if written.
+    """
+    tmp_path = f"{path}.tmp"
+    h = hashlib.sha256()
+    size = 0
+    with open(tmp_path, 'wb') as f:
+        for fragment in fragments:
+            data = fragment.encode('utf-8')
+            h.update(data)
+            size += len(data)
+            f.write(data)
+    if os.path.exists(path) and os.path.getsize(path) == size and _file_digest(path) == h.hexdigest():
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_if_changed(path, text):
+    """Writes `text` only when the file's bytes would change. Returns True if written."""
+    return write_stream_if_changed(path, [text])
+
+
+class PageDependencies:
+    """
+    Maps each output page to the hash of the inputs it was rendered from
+    (its report items, tool map and template version).
+    """
+
+    def __init__(self, path=PAGE_DEPS_FILE, force=False):
+        self.path = path
+        self.force = force
+        self.pages = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError):
+                self.pages = {}
+        self.seen = set()
+        self.rendered = 0
+        self.written = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _key(page_path):
+        return os.path.relpath(page_path, BASE_DIR).replace(os.sep, '/')
+
+    def is_stale(self, page_path, digest):
+        """True when the page must be re-rendered."""
+        name = self._key(page_path)
+        self.seen.add(name)
+        if self.force or not os.path.exists(page_path) or self.pages.get(name) != digest:
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, page_path, digest, written):
+        self.pages[self._key(page_path)] = digest
+        self.rendered += 1
+        if written:
+            self.written += 1
+
+    def save(self):
+        # Forget pages that are no longer produced
+        self.pages = {name: digest for name, digest in self.pages.items() if name in self.seen}
+        write_if_changed(self.path, json.dumps(self.pages, indent=2, sort_keys=True) + "\n")
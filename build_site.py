@@ -1,15 +1,41 @@
 import os
 import re
-import datetime
-import glob
+import hashlib
+import inspect
 import json
+import glob
 from collections import defaultdict
-from dateutil import parser
+from build_cache import ReportCache, PageDependencies, content_hash, write_stream_if_changed, write_if_changed
+from report_store import ReportStore
+import tracing
+import normalize
+import site_search
+import site_feeds
+import site_assets
+from normalize import clean_summary_text, reference_url, is_no_news, normalize_post_date
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 DOCS_DIR = os.path.join(BASE_DIR, "docs")
+# Bump when the meaning of normalized items changes (invalidates the build cache)
+NORMALIZE_VERSION = 1
+# Bump when page markup changes in a way the template fingerprint cannot see
+TEMPLATE_VERSION = 1
+# Cards per archive page; larger months are split into several pages
+ARCHIVE_PAGE_SIZE = int(os.environ.get("ARCHIVE_PAGE_SIZE", "50"))
+ARCHIVE_MANIFEST_FILE = os.path.join(DOCS_DIR, "archive_manifest.json")
+
+# Search page body; the index lives in docs/search/ and the client in docs/search.js
+SEARCH_PAGE_BODY = """
+            <div class="search-box">
+                <i class="fas fa-search"></i>
+                <input type="search" id="search-input" placeholder="ツール名・キーワードで検索（例: Claude 新機能）" autocomplete="off" autofocus>
+            </div>
+            <div id="search-status" class="search-status"></div>
+            <div id="search-results" class="search-results"></div>
+            <script src="search.js" defer></script>
+"""
 
 # Embedded HTML Template (Simple & Clean)
 HTML_HEADER = """
@@ -20,7 +46,9 @@ HTML_HEADER = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>AI TOOL NEWS</title>
     <meta name="description" content="AIツールの最新アップデートを自動収集・厳選してお届けするニュースサイト。ChatGPT, Gemini, Claude, Midjourney等の公式情報をリアルタイム配信。">
-    <link rel="stylesheet" href="styles.css">
+    <link rel="stylesheet" href="{stylesheet}">
+    <link rel="alternate" type="application/atom+xml" title="AI TOOL NEWS" href="feeds/all.xml">
+    <link rel="alternate" type="application/feed+json" title="AI TOOL NEWS" href="feeds/all.json">
     <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
 </head>
 <body>
@@ -33,6 +61,7 @@ HTML_HEADER = """
             <nav>
                 <a href="index.html" class="nav-link {active_latest}">Latest</a>
                 <a href="archives.html" class="nav-link {active_archives}">Archives</a>
+                <a href="search.html" class="nav-link {active_search}">Search</a>
             </nav>
         </header>
 
@@ -50,76 +79,34 @@ HTML_FOOTER = """
 </html>
 """
 
-def clean_summary_text(text, url=None, date=None):
-    """Clean up markdown markers, redundant info, dates, and URLs from summary text."""
-    # 1. Extract embedded URLs from the text before cleaning
-    embedded_urls = re.findall(r'https?://\S+', text)
-    
-    summary_lines = []
-    for line in text.split('\n'):
-        # Strip out the markers
-        clean_line = line.strip()
-        clean_line = re.sub(r'^(?:- )?(?:Post|Time|URL|\*\*Date\*\*|\*\*Summary\*\*|\*\*URL\*\*):', '', clean_line, flags=re.IGNORECASE).strip()
-        
-        if clean_line:
-            # Skip if line is JUST a date or JUST a URL
-            if (url and clean_line == url) or (date and clean_line == date):
-                continue
-            
-            # Remove date patterns like YYYY-MM-DD HH:MM
-            clean_line = re.sub(r'\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2})?', '', clean_line).strip()
-            
-            # Remove URLs from the text line
-            clean_line = re.sub(r'https?://\S+', '', clean_line).strip()
-            
-            if clean_line:
-                summary_lines.append(clean_line)
-    
-    summary = " ".join(summary_lines).strip()
-    # Clean up ** wrappers
-    summary = summary.replace("**", "").strip()
-    summary = summary.replace("\n", " ").replace("  ", " ")
-    
-    return summary, embedded_urls
-
-
-
-def load_targets():
-    """Loads targets.json to map tool names to twitter handles."""
+def read_targets():
+    """Raw targets.json (list of categories with their tools); empty if unreadable."""
     targets_path = os.path.join(BASE_DIR, "targets.json")
-    tool_map = {}
     try:
         with open(targets_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Flatten the list structure
-            for category in data:
-                for tool in category.get('tools', []):
-                    tool_map[tool['name']] = tool
-        return tool_map
+            return json.load(f)
     except Exception as e:
         print(f"Warning: Could not load targets.json: {e}")
-        return {}
+        return []
 
-def generate_html_from_items(items, title, tool_map):
-    """Generates full HTML page from a list of news items."""
-    content_html = ""
-    
-    # Determine active tab classes
-    active_latest = "active-latest" if "Latest" in title else ""
-    active_archives = "active-archives" if "Archive" in title else ""
-    
+def load_targets(targets=None):
+    """Loads targets.json to map tool names to twitter handles."""
+    tool_map = {}
+    # Flatten the list structure
+    for category in read_targets() if targets is None else targets:
+        for tool in category.get('tools', []):
+            tool_map[tool['name']] = tool
+    return tool_map
+
+def unique_items(items):
+    """Sorts items newest first and drops duplicate posts and "no news" entries."""
     # Sort items by Date (Newest first), then by Category
     # Use sort_date for full precision
     items.sort(key=lambda x: x.get('sort_date', x['date']), reverse=True)
-    
-    current_date = None
-    
-    # Regex for valid tweet URL (simple validation)
-    tweet_pattern = re.compile(r'https?://(www\.)?(twitter|x)\.com/[a-zA-Z0-9_]+/status/\d+')
 
     # Deduplication Logic
     seen = set()
-    unique_items = []
+    unique = []
     for item in items:
         # Create a unique signature for the news item
         # URL is the most reliable unique identifier for a social media post
@@ -138,14 +125,37 @@ def generate_html_from_items(items, title, tool_map):
         if "No significant news found" in item['summary'] or "no significant news found" in item['summary'].lower():
             continue
             
-        unique_items.append(item)
+        unique.append(item)
+    return unique
+
+def iter_html_from_items(items, title, tool_map, nav_html=""):
+    """Yields the HTML page for a list of news items fragment by fragment (header, cards, footer)."""
+    # Determine active tab classes
+    active_latest = "active-latest" if "Latest" in title else ""
+    active_archives = "active-archives" if "Archive" in title else ""
+
+    # If it's the latest page, the navigation link already shows the status clearly.
+    # Hide the redundant title for the index page.
+    header_html = ""
+    if "Latest" not in title:
+        header_html = f'<div style="text-align:center; margin-bottom:40px;"><h2 class="category-title">{title}</h2></div>'
+
+    yield HTML_HEADER.format(active_latest=active_latest, active_archives=active_archives, active_search="",
+                             stylesheet=site_assets.stylesheet_name()) + header_html + nav_html
     
+    current_date = None
+    
+    # Regex for valid tweet URL (simple validation)
+    tweet_pattern = re.compile(r'https?://(www\.)?(twitter|x)\.com/[a-zA-Z0-9_]+/status/\d+')
+
     # Use unique_items for generation
-    for item in unique_items:
+    has_content = False
+    for item in unique_items(items):
+        has_content = True
         # Date Header Grouping
         if item['date'] != current_date:
             current_date = item['date']
-            content_html += f'<h2 class="category-title">{current_date}</h2>'
+            yield f'<h2 class="category-title">{current_date}</h2>'
 
         # Resolve accounts for search fallback
         accounts = tool_map.get(item['tool'], {}).get('accounts', [])
@@ -213,103 +223,180 @@ def generate_html_from_items(items, title, tool_map):
             {card_buttons}
         </div>
         """
-        content_html += card
-        
-    if not content_html:
-        content_html = "<div class='no-news'>期間内のニュースは見つかりませんでした。</div>"
+        yield card
         
-    # If it's the latest page, the navigation link already shows the status clearly.
-    # Hide the redundant title for the index page.
-    header_html = ""
-    if "Latest" not in title:
-        header_html = f'<div style="text-align:center; margin-bottom:40px;"><h2 class="category-title">{title}</h2></div>'
+    if not has_content:
+        yield "<div class='no-news'>期間内のニュースは見つかりませんでした。</div>"
+
+    yield nav_html + HTML_FOOTER
 
-    return HTML_HEADER.format(active_latest=active_latest, active_archives=active_archives) + header_html + content_html + HTML_FOOTER
+def normalize_report(data):
+    """Normalizes one JSON report into a news item (None if it carries no news)."""
+    # Note: We still use the date processing logic inside our build
+    item_date_raw = data.get('post_date', 'Unknown Date')
+    summary_raw = data.get('summary', '')
+    url_main = data.get('url', '#')
+
+    # Use helper for consistency
+    clean_text, ext_urls = clean_summary_text(summary_raw, url_main, item_date_raw)
+    ref_url = reference_url(ext_urls, url_main)
+
+    item = {
+        "raw_date": item_date_raw,
+        "category": data.get('category', 'Uncategorized'),
+        "tool": data.get('tool', 'Unknown'),
+        "summary": clean_text,
+        "why": data.get('why', '詳細をご確認ください。'),
+        "score": data.get('score', 3),
+        "ref_url": ref_url,
+        "url": url_main,
+    }
+
+    # Apply date logic
+    item.update(process_item_date(item_date_raw, data.get('post_date_jst')))
+
+    if is_no_news(item['summary']):
+        return None
+    return item
+
+def normalizer_fingerprint():
+    """Identifies the normalization code, so cached items are dropped when it changes."""
+    source = "".join(inspect.getsource(obj) for obj in (normalize_report, normalize, process_item_date))
+    return f"{NORMALIZE_VERSION}:{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}"
 
 def load_all_reports():
-    """Scans JSON reports and parses them into news items."""
+    """Reads every report (daily segments + legacy files) into news items; unchanged files come from the cache."""
     all_items = []
-    
-    # Grid search all JSON reports (New Standard)
-    json_reports = glob.glob(os.path.join(REPORTS_DIR, "*", "*.json"))
-    print(f"  Scanning {len(json_reports)} JSON reports...")
-    for path in json_reports:
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Normalize JSON data to the item format
-                # Note: We still use the date processing logic inside our build
-                item_date_raw = data.get('post_date', 'Unknown Date')
-                summary_raw = data.get('summary', '')
-                url_main = data.get('url', '#')
-                
-                # Use helper for consistency
-                clean_text, ext_urls = clean_summary_text(summary_raw, url=url_main, date=item_date_raw)
-                ref_url = ext_urls[0] if ext_urls and ext_urls[0] != url_main else None
-
-                item = {
-                    "raw_date": item_date_raw,
-                    "category": data.get('category', 'Uncategorized'),
-                    "tool": data.get('tool', 'Unknown'),
-                    "summary": clean_text,
-                    "why": data.get('why', '詳細をご確認ください。'),
-                    "score": data.get('score', 3),
-                    "ref_url": ref_url,
-                    "url": url_main,
-                }
-                
-                # Apply date logic
-                item.update(process_item_date(item_date_raw))
-                
-                if "No significant news found" not in item['summary']:
-                    all_items.append(item)
-        except Exception as e:
-            print(f"    ⚠️ Error parsing JSON {path}: {e}")
+    store = ReportStore(REPORTS_DIR)
+    cache = ReportCache(normalizer_fingerprint(), store.root)
 
-    return all_items
+    sources = store.sources()
+    print(f"  Scanning {len(sources)} report file(s)...")
+    for rel_path, stat in sources:
+        items = cache.get(rel_path, stat)
+        if items is None:
+            try:
+                items = [item for item in (normalize_report(data) for _, data in store.read_source(rel_path)) if item]
+                cache.put(rel_path, stat, items)
+            except Exception as e:
+                print(f"    ⚠️ Error parsing {rel_path}: {e}")
+                continue
+        all_items.extend(items)
 
-def process_item_date(date_raw):
-    """Helper to unify date processing."""
-    display_date = date_raw
-    sort_date = date_raw
-    item_date = "Unknown Date"
+    cache.prune(rel_path for rel_path, _ in sources)
+    cache.save()
+    print(f"  Build cache: {cache.hits} cached, {cache.misses} parsed")
 
-    try:
-        clean_date = re.sub(r'\(?(GMT|UTC|JST)\)?', '', date_raw).strip()
-        dt = parser.parse(clean_date)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=datetime.timezone.utc)
-        jst = datetime.timezone(datetime.timedelta(hours=9))
-        dt_jst = dt.astimezone(jst)
-        
-        display_date = dt_jst.strftime("%Y年%m月%d日 %H時%M分")
-        sort_date = dt_jst.strftime("%Y-%m-%d %H:%M")
-        item_date = dt_jst.strftime("%Y-%m-%d")
-    except (ValueError, TypeError, OverflowError):
-         match = re.search(r'(\d{4}-\d{2}-\d{2})', date_raw)
-         if match:
-             item_date = match.group(1)
-         elif date_raw != "Unknown Date" and len(date_raw) >= 10:
-             item_date = date_raw[:10]
-    
+    return all_items
+
+def process_item_date(date_raw, post_date_jst=None):
+    """Helper to unify date processing (fast path + memoization in normalize.py)."""
+    item_date, sort_date, display_date = normalize_post_date(date_raw, post_date_jst)
     return {
         "date": item_date,
         "sort_date": sort_date,
         "display_date": display_date
     }
 
+def plan_archive_pages(month, items, page_size=ARCHIVE_PAGE_SIZE):
+    """
+    Splits a month's unique items (newest first) into pages of `page_size` counted from the
+    oldest item. The newest, partly filled page is the month's landing page (archive_YYYY-MM.html);
+    full pages keep a fixed file (archive_YYYY-MM_p{k}.html, k=1 oldest) and fixed contents,
+    so new items only change the landing page. Returns the pages newest first.
+
+    A landing page with fewer than `page_size // 2` items is merged into the last full page, so
+    the landing page holds up to page_size + page_size // 2 - 1 items (74 at the default 50) and a
+    month is only split once it has more than that. When the landing page reaches page_size // 2
+    leftover items, the full page it carried becomes a new _p{k} file, and the previous _p{k-1}
+    page is re-rendered once for its "newer" link.
+    """
+    oldest_first = items[::-1]
+    chunks = [oldest_first[i:i + page_size] for i in range(0, len(oldest_first), page_size)] or [[]]
+    if len(chunks) > 1 and len(chunks[-1]) < page_size // 2:
+        # Don't leave a nearly empty landing page: it takes the last full page with it
+        chunks[-2:] = [chunks[-2] + chunks[-1]]
+    files = [f"archive_{month}_p{k}.html" for k in range(1, len(chunks))] + [f"archive_{month}.html"]
+
+    pages = []
+    for k in range(len(chunks) - 1, -1, -1):
+        page_items = chunks[k][::-1]
+        pages.append({
+            "file": files[k],
+            "items": page_items,
+            "from": page_items[-1]['date'] if page_items else None,
+            "to": page_items[0]['date'] if page_items else None,
+            "newer": files[k + 1] if k + 1 < len(chunks) else None,
+            "older": files[k - 1] if k > 0 else None,
+        })
+    return pages
+
+def archive_nav_html(page):
+    """Newer/older links and the page's date range (only for months split into several pages)."""
+    if not page['newer'] and not page['older']:
+        return ""
+    newer = (f'<a href="{page["newer"]}" class="pager-link"><i class="fas fa-chevron-left"></i> 新しい記事</a>'
+             if page['newer'] else '<span class="pager-link disabled"></span>')
+    older = (f'<a href="{page["older"]}" class="pager-link">古い記事 <i class="fas fa-chevron-right"></i></a>'
+             if page['older'] else '<span class="pager-link disabled"></span>')
+    return (f'<div class="archive-pager">{newer}'
+            f'<span class="pager-range">{page["from"]} 〜 {page["to"]}（{len(page["items"])}件）</span>'
+            f'{older}</div>')
+
+def render_archive_page(deps, template, tool_map, month, page, docs_dir=DOCS_DIR):
+    """Renders one archive page; only its own items and neighbour links go into its hash."""
+    nav_html = archive_nav_html(page)
+    render_page(
+        deps, os.path.join(docs_dir, page['file']),
+        content_hash(template, tool_map, page['items'], nav_html),
+        lambda: iter_html_from_items(page['items'], f"Archive: {month}", tool_map, nav_html),
+    )
+
+def remove_stale_archive_pages(month, pages, docs_dir=DOCS_DIR):
+    """Deletes numbered pages of a month that the current plan no longer produces."""
+    live = {page['file'] for page in pages}
+    for path in glob.glob(os.path.join(docs_dir, f"archive_{month}_p*.html")):
+        if os.path.basename(path) not in live:
+            os.remove(path)
+            print(f"  -> Removed: {os.path.basename(path)}")
+
+def template_fingerprint():
+    """Identifies the page template, so every page is re-rendered when it changes."""
+    source = HTML_HEADER + HTML_FOOTER + inspect.getsource(iter_html_from_items) + inspect.getsource(unique_items)
+    # Pages link to the fingerprinted stylesheet, and minification changes their bytes
+    source += f"{site_assets.stylesheet_name()}:{site_assets.ASSET_MINIFY}"
+    return f"{TEMPLATE_VERSION}:{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}"
+
+def render_page(deps, filepath, digest, render):
+    """Re-renders a page only when its inputs changed; writes only when its bytes changed."""
+    filename = os.path.basename(filepath)
+    if not deps.is_stale(filepath, digest):
+        print(f"  -> Skipped (Unchanged): {filename}")
+        return
+    written = write_stream_if_changed(filepath, site_assets.minify_html_stream(filename, render()))
+    deps.record(filepath, digest, written)
+    print(f"  -> {'Rebuilt' if written else 'Rendered (Identical)'}: {filename}")
+
+@tracing.traced("site.build")
 def build():
     print("Starting build process...")
     
     # Load targets for account mapping
-    tool_map = load_targets()
+    targets = read_targets()
+    tool_map = load_targets(targets)
 
     # Load all items from both formats
     all_items = load_all_reports()
     
     print(f"Total News Items Found: {len(all_items)}")
 
+    # Each page is rebuilt only when the hash of its inputs changes
+    force_rebuild = os.environ.get("FORCE_REBUILD") == "true"
+    deps = PageDependencies(force=force_rebuild)
+    template = template_fingerprint()
+    # Minified styles.css under a content-hashed name (pages link to it)
+    stylesheet = site_assets.publish_stylesheet(DOCS_DIR)
+
     # 1. Generate Index (Latest 3 Days)
     # Get unique dates present in items
     unique_dates = sorted(list(set(i['date'] for i in all_items if i['date'] != 'Unknown Date')), reverse=True)
@@ -317,12 +404,13 @@ def build():
     
     latest_items = [i for i in all_items if i['date'] in latest_3_dates]
     
-    index_html = generate_html_from_items(latest_items, "Latest News (3 Days)", tool_map)
-    with open(os.path.join(DOCS_DIR, "index.html"), 'w', encoding='utf-8') as f:
-        f.write(index_html)
-    print("Generated index.html")
+    render_page(
+        deps, os.path.join(DOCS_DIR, "index.html"),
+        content_hash(template, tool_map, latest_items),
+        lambda: iter_html_from_items(latest_items, "Latest News (3 Days)", tool_map),
+    )
 
-    # 2. Generate Monthly Archives
+    # 2. Generate Monthly Archives (split into pages of ARCHIVE_PAGE_SIZE)
     # Group by YYYY-MM
     months = defaultdict(list)
     for item in all_items:
@@ -331,46 +419,27 @@ def build():
         months[month_key].append(item)
         
     archive_links_html = '<div class="archive-grid">'
-    
-    # Optimization: Only rebuild recent months
-    JST = datetime.timezone(datetime.timedelta(hours=9))
-    now = datetime.datetime.now(JST)
-    current_month = now.strftime("%Y-%m")
-    # Simple logic for prev month (handle year rollover loosely or just use library)
-    # Actually, easiest is just to parse year/month
-    # Let's just update "This Month" and "Last Month" (calculated robustly)
-    
-    # Calculate Previous Month string
-    first_day = now.replace(day=1)
-    prev_month_date = first_day - datetime.timedelta(days=1)
-    prev_month = prev_month_date.strftime("%Y-%m")
-    
-    targets_to_build = {current_month, prev_month}
-    
-    print(f"⚡ Incremental Build Active. Targets: {targets_to_build}")
+    manifest = {"page_size": ARCHIVE_PAGE_SIZE, "months": []}
+    month_pages = {}
     
     for month, items in sorted(months.items(), reverse=True):
         filename = f"archive_{month}.html"
-        filepath = os.path.join(DOCS_DIR, filename)
-        
-        # Build if:
-        # 1. It is a target month (Current/Prev)
-        # 2. File doesn't exist yet (New historical import?)
-        # 3. Forced re-build (Environment variable or flag)
-        
-        force_rebuild = os.environ.get("FORCE_REBUILD") == "true"
-        
-        if month in targets_to_build or not os.path.exists(filepath) or force_rebuild:
-            month_items = sorted(items, key=lambda x: x.get('sort_date', x['date']), reverse=True)
-            month_html = generate_html_from_items(month_items, f"Archive: {month}", tool_map)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(month_html)
-            print(f"  -> Rebuilt: {filename}")
-        else:
-            print(f"  -> Skipped (Cached): {filename}")
         
+        # Pages are anchored at the oldest item: a new item re-renders only the landing page,
+        # late-arriving reports re-render the pages from their position onwards.
+        pages = plan_archive_pages(month, unique_items(items))
+        for page in pages:
+            render_archive_page(deps, template, tool_map, month, page)
+        remove_stale_archive_pages(month, pages)
+        month_pages[month] = pages
+        manifest["months"].append({
+            "month": month,
+            "items": len(items),
+            "pages": [{"file": p['file'], "from": p['from'], "to": p['to'], "count": len(p['items'])} for p in pages],
+        })
+
         # Add to Index Link (Always needed)
-        archive_links_html += f"""
+        month_card = f"""
             <a href='{filename}' class='archive-item-link'>
                 <div class='archive-card'>
                     <div class='archive-card-content'>
@@ -381,16 +450,51 @@ def build():
                 </div>
             </a>
         """
+        if len(pages) > 1:
+            # Split months also list their pages, labelled by date range
+            page_links = "".join(
+                f"<a href='{p['file']}' class='archive-page-link'>{p['from'][5:]} 〜 {p['to'][5:]}</a>" for p in pages
+            )
+            month_card = f"<div class='archive-month'>{month_card}<div class='archive-pages'>{page_links}</div></div>"
+        archive_links_html += month_card
 
     archive_links_html += "</div>"
     
+    # Page manifest (month -> pages with date ranges), for navigation and tooling
+    write_if_changed(ARCHIVE_MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=2) + "\n")
+
     # 3. Generate Archives Index
     # Use active_archives class
     header_html = '<div style="text-align:center; margin-bottom:60px;"><h2 class="category-title">Select Month</h2></div>'
-    archives_page = HTML_HEADER.format(active_latest="", active_archives="active-archives") + header_html + archive_links_html + HTML_FOOTER
-    with open(os.path.join(DOCS_DIR, "archives.html"), 'w', encoding='utf-8') as f:
-        f.write(archives_page)
-    print("Generated archives.html")
+    archives_page = HTML_HEADER.format(active_latest="", active_archives="active-archives", active_search="",
+                                       stylesheet=stylesheet) + header_html + archive_links_html + HTML_FOOTER
+    render_page(
+        deps, os.path.join(DOCS_DIR, "archives.html"),
+        content_hash(template, archives_page),
+        lambda: [archives_page],
+    )
+
+    # 4. Search index (one shard per month, only new cards are tokenized) and search page
+    with tracing.span("site.search_index"):
+        site_search.update_search_index(month_pages)
+    search_page = HTML_HEADER.format(active_latest="", active_archives="", active_search="active-search",
+                                     stylesheet=stylesheet) + SEARCH_PAGE_BODY + HTML_FOOTER
+    render_page(
+        deps, os.path.join(DOCS_DIR, "search.html"),
+        content_hash(template, search_page),
+        lambda: [search_page],
+    )
+
+    # 5. Atom / JSON feeds (global, per category, per tool) from the same normalized items
+    with tracing.span("site.feeds"):
+        site_feeds.update_feeds(unique_items(all_items), targets)
+
+    deps.save()
+    print(f"⚡ Pages: {deps.rendered} rendered, {deps.written} written, {deps.skipped} unchanged")
+
+    # 6. Precompressed .gz/.br siblings for whatever changed, and bytes saved per page
+    with tracing.span("site.assets"):
+        site_assets.print_report(site_assets.precompress(DOCS_DIR))
 
 if __name__ == "__main__":
     build()
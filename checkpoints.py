@@ -0,0 +1,145 @@
+"""
+Collection checkpoints per X handle and per category (checkpoints.json).
+
+The file is tracked in git like seen_posts.jsonl and is committed with the
+reports, so each fresh checkout in the Actions workflow resumes where the last
+run stopped.
+
+For each handle:
+- searched_to: the end of the last search window that was fully processed.
+- newest_status / newest_post: the newest post seen from it (status ID and JST time).
+
+Search windows start at the handles' searched_to, so consecutive runs no longer
+re-fetch overlapping hours. After downtime, the gap is caught up in at most
+CATCHUP_MAX_WINDOWS windows of CATCHUP_WINDOW_HOURS each; anything older is
+skipped and reported. Posts in the overlap are deduplicated by SEEN_POSTS, not
+by status ID: a late-indexed post may be older than the newest one seen, and
+the IDs come from LLM output. newest_status is informational only.
+
+Checkpoints are per handle rather than per shard, so they survive edits to
+targets.json. Per-category entries summarize the category's handles.
+
+    python checkpoints.py          # show checkpoints
+"""
+import os
+import re
+import json
+import math
+import datetime
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_FILE = os.path.join(BASE_DIR, "checkpoints.json")
+JST = datetime.timezone(datetime.timedelta(hours=9))
+
+# Longest single search window during catch-up, and how many of them one search may use
+CATCHUP_WINDOW_HOURS = float(os.environ.get("CATCHUP_WINDOW_HOURS", "6"))
+CATCHUP_MAX_WINDOWS = int(os.environ.get("CATCHUP_MAX_WINDOWS", "4"))
+# Windows start this much before searched_to, for posts that reach search late
+WINDOW_OVERLAP = datetime.timedelta(minutes=10)
+
+_STATUS_URL_RE = re.compile(r'https?://(?:www\.)?(?:twitter|x)\.com/([A-Za-z0-9_]+)/status/(\d+)')
+
+
+def parse_status_url(url):
+    """(handle in lower case, status ID as int) of a post URL, or (None, None)."""
+    match = _STATUS_URL_RE.match(url or "")
+    if not match:
+        return None, None
+    return match.group(1).lower(), int(match.group(2))
+
+
+def _time(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def _iso(dt):
+    return dt.astimezone(JST).isoformat(timespec="seconds")
+
+
+class CheckpointStore:
+    def __init__(self, path=CHECKPOINT_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.handles = {}
+        self.categories = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.handles = data.get("handles", {})
+            self.categories = data.get("categories", {})
+        except (OSError, ValueError):
+            pass
+
+    # --- windows ---
+
+    def searched_to(self, handles):
+        """Where searching for these handles should resume (None if any of them was never searched)."""
+        with self._lock:
+            marks = [_time(self.handles.get(h.lower(), {}).get("searched_to")) for h in handles]
+        if not marks or any(mark is None for mark in marks):
+            return None
+        return min(marks)
+
+    def plan_windows(self, handles, now, default_window):
+        """
+        Search windows [(start, end), ...] oldest first, ending at `now`.
+        Never-searched handles get one `default_window`; a longer gap since the checkpoint is split
+        into equal windows of at most CATCHUP_WINDOW_HOURS, at most CATCHUP_MAX_WINDOWS of them.
+        """
+        resume = self.searched_to(handles)
+        start = now - default_window if resume is None else min(resume - WINDOW_OVERLAP, now - WINDOW_OVERLAP)
+        limit = datetime.timedelta(hours=CATCHUP_WINDOW_HOURS)
+        oldest = now - limit * CATCHUP_MAX_WINDOWS
+        if start < oldest:
+            print(f"  ⚠️ Catch-up limited to {CATCHUP_MAX_WINDOWS * CATCHUP_WINDOW_HOURS:g}h: "
+                  f"{_iso(start)} - {_iso(oldest)} is not searched")
+            start = oldest
+        count = max(1, math.ceil((now - start) / limit - 1e-9))
+        step = (now - start) / count
+        return [(start + step * i, now if i == count - 1 else start + step * (i + 1)) for i in range(count)]
+
+    # --- posts ---
+
+    def observe(self, post_url, post_time=None, category=None):
+        """Records a handled post as its handle's (and category's) newest when it is newer."""
+        handle, status = parse_status_url(post_url)
+        if handle is None:
+            return
+        with self._lock:
+            for entry in (self.handles.setdefault(handle, {}),
+                          self.categories.setdefault(category, {}) if category else None):
+                if entry is None:
+                    continue
+                if entry.get("newest_status") is None or status > int(entry["newest_status"]):
+                    entry["newest_status"] = str(status)
+                    entry["newest_post"] = post_time
+
+    def mark_searched(self, handles, end, category=None):
+        """Records that every post of `handles` up to `end` has been processed."""
+        with self._lock:
+            for h in handles:
+                entry = self.handles.setdefault(h.lower(), {})
+                if not entry.get("searched_to") or _time(entry["searched_to"]) < end:
+                    entry["searched_to"] = _iso(end)
+            if category:
+                self.categories.setdefault(category, {})["searched_to"] = _iso(end)
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"handles": self.handles, "categories": self.categories}, f,
+                          ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+if __name__ == "__main__":
+    store = CheckpointStore()
+    print(f"{'category':<30} {'searched to':<26} newest post")
+    for name, entry in sorted(store.categories.items()):
+        print(f"{name:<30} {entry.get('searched_to') or '-':<26} {entry.get('newest_post') or '-'}")
+    print(f"\n{'handle':<30} {'searched to':<26} newest post")
+    for handle, entry in sorted(store.handles.items()):
+        print(f"@{handle:<29} {entry.get('searched_to') or '-':<26} {entry.get('newest_post') or '-'}")
@@ -0,0 +1,126 @@
+"""
+Single entry point for the pipeline. Stages run in-process, and each subcommand
+imports only the modules it needs (tweepy / google-genai / requests are loaded
+on first use).
+
+    python cli.py collect        # collect_ai_news.py
+    python cli.py post           # post_to_x.py
+    python cli.py build          # build_site.py
+    python cli.py run-all        # collect -> post -> build + push once, in one interpreter
+    python cli.py daemon         # collector_daemon.py
+    python cli.py startup        # import time per subcommand (-X importtime breakdown)
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommand -> modules it imports before running
+STAGES = {
+    "collect": ["collect_ai_news"],
+    "post": ["post_to_x"],
+    "build": ["build_site"],
+    "run-all": ["collect_ai_news", "post_to_x", "build_site"],
+    "daemon": ["collector_daemon"],
+}
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def load_stage(command):
+    """Imports the modules of a subcommand. Returns them by name."""
+    return {name: importlib.import_module(name) for name in STAGES[command]}
+
+
+def run_stage(command, modules, argv):
+    if command == "collect":
+        modules["collect_ai_news"].main()
+    elif command == "post":
+        modules["post_to_x"].main()
+    elif command == "build":
+        modules["build_site"].build()
+    elif command == "run-all":
+        collector = modules["collect_ai_news"]
+        collector.main(deliver=False)
+        # Anything the realtime path could not post (e.g. missing credentials earlier in the day)
+        modules["post_to_x"].main()
+        # One build and one push for the new reports and the ledger lines the post stage added
+        collector.DELIVERY_QUEUE.close(force=True)
+    elif command == "daemon":
+        return modules["collector_daemon"].main(argv)
+
+
+def import_breakdown(command):
+    """
+    Imports a subcommand's modules in a fresh interpreter with -X importtime.
+    Returns (total seconds, [(top-level package, cumulative seconds), ...] slowest first).
+    """
+    code = f"import cli; cli.load_stage({command!r})"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    packages = {}
+    # Interpreter startup (site, encodings) and cli itself come first; only what follows is the stage's
+    stage_started = False
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        if not stage_started:
+            stage_started = match.group(4) == "cli" and not match.group(3)
+            continue
+        # Nested imports are already included in their importer's cumulative time
+        if not match.group(3):
+            name = match.group(4).split('.')[0]
+            packages[name] = packages.get(name, 0) + int(match.group(2)) / 1e6
+    return sum(packages.values()), sorted(packages.items(), key=lambda p: -p[1])
+
+
+def print_startup(commands, top):
+    print(f"{'subcommand':<10} {'imports':>9}  slowest top-level imports")
+    for command in commands:
+        try:
+            total, packages = import_breakdown(command)
+        except RuntimeError as e:
+            print(f"{command:<10} {'-':>9}  ❌ {e}")
+            continue
+        slowest = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in packages[:top])
+        print(f"{command:<10} {total * 1000:>7.0f}ms  {slowest}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI TOOL NEWS pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("collect", help="search X via xAI, filter with Gemini, post and publish new items")
+    sub.add_parser("post", help="post today's and yesterday's unposted items to X")
+    sub.add_parser("build", help="build the static site in docs/")
+    sub.add_parser("run-all", help="collect -> post -> build and push once, in one process")
+    daemon = sub.add_parser("daemon", help="run the collector as a long-lived process")
+    daemon.add_argument("--ticks", type=int, default=0, help="stop after this many polling rounds (0 = run forever)")
+    startup = sub.add_parser("startup", help="import time per subcommand (-X importtime breakdown)")
+    startup.add_argument("commands", nargs="*", metavar="subcommand", help="subcommands to measure (default: all)")
+    startup.add_argument("--top", type=int, default=4, help="top-level imports to list per subcommand")
+
+    args = parser.parse_args(argv)
+    if args.command == "startup":
+        unknown = [c for c in args.commands if c not in STAGES]
+        if unknown:
+            parser.error(f"unknown subcommand(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+        print_startup(args.commands or list(STAGES), args.top)
+        return 0
+
+    started = time.perf_counter()
+    modules = load_stage(args.command)
+    print(f"⏱️ {args.command}: ready in {(time.perf_counter() - started) * 1000:.0f}ms")
+    daemon_argv = ["--ticks", str(args.ticks)] if args.command == "daemon" else None
+    return run_stage(args.command, modules, daemon_argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,30 @@
 import os
+import sys
 import json
 import time
 import datetime
-import hashlib
-import requests
-import subprocess
-from post_to_x import post_item_to_x, get_twitter_client
-
-# X Client (Persistent if possible)
-X_CLIENT = None
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limit import TokenBucket
+from xai_client import XAIClient, XAIError, extract_output_text
+from delivery import DeliveryQueue
+from dedup_index import SeenPostsIndex
+from report_store import ReportStore, report_id
+from checkpoints import CheckpointStore
+import post_spool
+import replay
+import tracing
+from normalize import post_date_jst
+
+# Site rebuild + git push are batched: one build and one push per flush
+DELIVERY_QUEUE = DeliveryQueue()
+# Posts already handled on any day, under any tool name
+SEEN_POSTS = SeenPostsIndex()
+# Daily report segments (reports/YYYY-MM-DD.jsonl)
+REPORT_STORE = ReportStore()
+# Per-handle search progress and newest posts (checkpoints.json, committed with the reports)
+CHECKPOINTS = CheckpointStore()
 
 # Configuration
 def load_api_key():
@@ -21,26 +37,58 @@ def load_api_key():
     return os.environ.get("XAI_API_KEY")
 
 API_KEY = load_api_key()
-# Use Responses API for server-side agentic x_search
-API_URL = "https://api.x.ai/v1/responses"
+# Use Responses API for server-side agentic x_search (XAI_API_URL points it at a stub server)
+API_URL = os.environ.get("XAI_API_URL", "https://api.x.ai/v1/responses")
 # [IMMUTABLE] DO NOT CHANGE without user's explicit consent.
 # This specific model is chosen for its non-reasoning agentic speed.
 MODEL = "grok-4-1-fast-non-reasoning" 
 
 
 TARGETS_FILE = "targets.json"
-BASE_REPORT_DIR = "reports"
-
 
+# Collection mode: "parallel" fans categories out over a thread pool, "sequential" runs them one by one
+COLLECT_MODE = os.environ.get("COLLECT_MODE", "parallel")
+COLLECT_CONCURRENCY = int(os.environ.get("COLLECT_CONCURRENCY", "3"))
+# Shared xAI request budget (default matches the old fixed 15s pacing between categories)
+XAI_RATE_PER_MIN = float(os.environ.get("XAI_RATE_PER_MIN", "4"))
+XAI_BUCKET = TokenBucket(XAI_RATE_PER_MIN, capacity=COLLECT_CONCURRENCY)
+# Legacy pacing, kept only to report the savings against the old sequential loop
+LEGACY_CATEGORY_SLEEP = 15
+# Gemini stage: workers shared by all categories (0 = score chunks one by one in the category's thread)
+GEMINI_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", "4"))
+# Chunks queued or being scored at once; categories wait to submit more (backpressure)
+GEMINI_MAX_INFLIGHT = int(os.environ.get("GEMINI_MAX_INFLIGHT", str(max(GEMINI_CONCURRENCY, 1) * 2)))
+_GEMINI_SLOTS = threading.BoundedSemaphore(max(GEMINI_MAX_INFLIGHT, 1))
+_GEMINI_POOL_LOCK = threading.Lock()
+_gemini_executor = None
+# xAI x_search limit: max 10 handles per request (larger categories are sharded)
+XAI_MAX_HANDLES = 10
+# Search window for handles without a checkpoint (4時間おきの実行に合わせる)
+DEFAULT_WINDOW = datetime.timedelta(hours=4.2)
+
+
+
+_xai_client = None
+_xai_client_lock = threading.Lock()
+
+def get_xai_client():
+    """Shared pooled xAI client (keep-alive connections reused across categories and shards)."""
+    global _xai_client
+    with _xai_client_lock:
+        if _xai_client is None:
+            if replay.REPLAY_ENABLED:
+                # Offline run against the local replay server (see replay.py)
+                api_key, api_url = "replay", replay.xai_url()
+            else:
+                api_key, api_url = API_KEY, API_URL
+            _xai_client = XAIClient(api_key, api_url=api_url, bucket=XAI_BUCKET,
+                                    pool_size=COLLECT_CONCURRENCY * 2, backoff_base=5.0)
+        return _xai_client
 
-def setup_report_dir():
-    """Creates a directory for today's reports."""
+def report_day():
+    """Today's date (JST): reports collected now go to this day's segment."""
     JST = datetime.timezone(datetime.timedelta(hours=9))
-    today = datetime.datetime.now(JST).strftime("%Y-%m-%d")
-    path = os.path.join(BASE_REPORT_DIR, today)
-    if not os.path.exists(path):
-        os.makedirs(path)
-    return path
+    return datetime.datetime.now(JST).strftime("%Y-%m-%d")
 
 def load_targets():
     """Loads the monitoring targets from JSON."""
@@ -49,86 +97,148 @@ def load_targets():
 
 def realtime_delivery(item):
     """
-    Handles immediate delivery to X and update of the Web site.
+    Hands the item to the X post spool (posted by a background worker, so collection never
+    waits on X) and queues it for the batched site update.
     """
-    global X_CLIENT
     print(f"🚀 Real-time Delivery Initiated: {item['tool']}")
-    
-    # 1. Post to X
-    if X_CLIENT is None:
-        X_CLIENT = get_twitter_client()
-    
-    # Prepare item for post_to_x format (needs id)
-    x_item = item.copy()
-    x_item['id'] = item['url']
-    
-    posted = post_item_to_x(x_item, X_CLIENT)
-    
-    # 2. Update Web Site
-    print("  🏗️ Rebuilding site...")
-    try:
-        env = os.environ.copy()
-        env["PYTHONIOENCODING"] = "utf-8"
-        res = subprocess.run(["python", "build_site.py"], check=True, capture_output=True, text=True, encoding="utf-8", env=env)
-        print("  ✅ Site rebuilt.")
-    except subprocess.CalledProcessError as e:
-        print(f"  ❌ Site rebuild failed: {e}")
-        print(f"  STDOUT: {e.stdout}")
-        print(f"  STDERR: {e.stderr}")
-        return
-    except Exception as e:
-        print(f"  ❌ Error during site rebuild: {e}")
-        return
-
-    # 3. Git Push
-    print("  ☁️ Pushing to GitHub...")
-    try:
-        # Stage only necessary files
-        subprocess.run(["git", "add", "."], check=True)
-        commit_msg = f"News Update: {item['tool']} ({datetime.datetime.now().strftime('%H:%M')})"
-        subprocess.run(["git", "commit", "-m", commit_msg], check=True)
-        
-        # Pull first to avoid conflicts
-        subprocess.run(["git", "pull", "--rebase"], check=True)
-        subprocess.run(["git", "push"], check=True)
-        print("  🛰️ Push complete. Live at https://tadfuji.github.io/AI_TOOL_NEWS/")
-    except Exception as e:
-        print(f"  ⚠️ Git sync noted: {e}")
+    with tracing.span("delivery.realtime"):
+        # Prepare item for post_to_x format (needs id)
+        x_item = item.copy()
+        x_item['id'] = item['url']
+        post_spool.get_worker().enqueue(x_item)
+    DELIVERY_QUEUE.add(item)
+
+def plan_handle_shards(tools_list, max_handles=XAI_MAX_HANDLES):
+    """
+    Splits a category into shards of at most `max_handles` X handles.
+    A tool's accounts stay in one shard unless the tool alone exceeds the limit.
+    Returns a list of {"tools": [...], "handles": [...]}.
+    """
+    shards = []
+    current = {"tools": [], "handles": []}
+    for t in tools_list:
+        handles = []
+        for acc in t['accounts']:
+            clean_acc = acc.lstrip('@').strip()
+            if clean_acc and clean_acc not in handles:
+                handles.append(clean_acc)
+        new = [h for h in handles if h not in current["handles"]]
+        if current["tools"] and len(current["handles"]) + len(new) > max_handles:
+            shards.append(current)
+            current = {"tools": [], "handles": []}
+            new = handles
+        # A tool with more accounts than one request allows is spread over several shards
+        split = False
+        while len(new) > max_handles - len(current["handles"]):
+            split = True
+            room = max_handles - len(current["handles"])
+            part, new = new[:room], new[room:]
+            current["tools"].append({**t, "accounts": [f"@{h}" for h in part]})
+            current["handles"].extend(part)
+            shards.append(current)
+            current = {"tools": [], "handles": []}
+        current["tools"].append({**t, "accounts": [f"@{h}" for h in new]} if split else t)
+        current["handles"].extend(new)
+    if current["tools"]:
+        shards.append(current)
+    return shards
+
+def merge_shard_results(shard_results):
+    """Merges shard answers: one entry per (tool_name, post_url), news beats no-news."""
+    merged = []
+    seen = set()
+    with_news = set()
+    for results in shard_results:
+        for item in results:
+            if isinstance(item, dict) and item.get('has_news'):
+                key = (item.get('tool_name'), item.get('post_url'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                with_news.add(item.get('tool_name'))
+                merged.append(item)
+    for results in shard_results:
+        for item in results:
+            if isinstance(item, dict) and not item.get('has_news'):
+                tool_name = item.get('tool_name')
+                if tool_name in with_news or (tool_name, None) in seen:
+                    continue
+                seen.add((tool_name, None))
+                merged.append(item)
+    return merged
 
-def get_category_news(category_name, tools_list):
+@tracing.traced("xai.category_search")
+def get_category_news(category_name, tools_list, progress=None):
     """
     Queries xAI Responses API with built-in x_search tool.
-    The API executes X searches server-side and returns results.
+    Each shard's window starts at its handles' checkpoints (several windows when
+    catching up after downtime).
+    Categories with more handles than one x_search request allows are split
+    into shards that run concurrently; their results are merged and deduplicated.
+    `progress` (a dict) receives {handle: end of the last window searched successfully}.
+    """
+    now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
+    progress = {} if progress is None else progress
+
+    shards = plan_handle_shards(tools_list)
+    for n, shard in enumerate(shards, 1):
+        print(f"  🧩 Shard {n}/{len(shards)}: {len(shard['handles'])} handles ({', '.join(shard['handles'])})")
+
+    def run(shard):
+        windows = CHECKPOINTS.plan_windows(shard['handles'], now, DEFAULT_WINDOW)
+        return search_shard_windows(shard, windows, now, progress)
+
+    if len(shards) == 1:
+        return run(shards[0])
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        answers = list(pool.map(run, shards))
+
+    shard_results = []
+    for n, answer in enumerate(answers, 1):
+        if isinstance(answer, list):
+            shard_results.append(answer)
+        else:
+            print(f"  ⚠️ Shard {n}/{len(shards)} failed ({', '.join(shards[n - 1]['handles'])}): {answer}")
+    if not shard_results:
+        return answers[0]
+    return merge_shard_results(shard_results)
+
+def search_shard_windows(shard, windows, now, progress):
+    """
+    Searches a shard window by window (oldest first) and merges the answers.
+    Stops at the first failed window; `progress` records how far the shard got.
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {API_KEY}"
-    }
-    
-    JST = datetime.timezone(datetime.timedelta(hours=9))
-    now = datetime.datetime.now(JST)
     current_date = now.strftime("%Y-%m-%d")
-    # 検索範囲を4.2時間に拡張 (4時間おきの実行に合わせる)
-    from_date = (now - datetime.timedelta(hours=4.2)).strftime("%Y-%m-%dT%H:%M:%S")
-    
-    # Collect all X handles for this category (max 10 for x_search)
-    all_accounts = []
+    answers = []
+    for n, (window_start, window_end) in enumerate(windows, 1):
+        if len(windows) > 1:
+            print(f"  ⏪ Catch-up window {n}/{len(windows)}: {window_start:%m-%d %H:%M} - {window_end:%m-%d %H:%M}")
+        # The last window runs to today's date, as before; earlier ones end at their own time
+        to_date = current_date if window_end == now else window_end.strftime("%Y-%m-%dT%H:%M:%S")
+        answer = search_shard(shard, current_date, window_start.strftime("%Y-%m-%dT%H:%M:%S"), to_date)
+        if not isinstance(answer, list):
+            if not answers:
+                return answer
+            print(f"  ⚠️ Catch-up stopped at window {n}/{len(windows)}: {answer}")
+            break
+        answers.append(answer)
+        for handle in shard['handles']:
+            progress[handle] = window_end
+    return answers[0] if len(answers) == 1 else merge_shard_results(answers)
+
+def search_shard(shard, current_date, from_date, to_date=None):
+    """One x_search request for a shard (at most XAI_MAX_HANDLES handles)."""
     tools_desc = ""
-    for t in tools_list:
+    for t in shard['tools']:
         tools_desc += f"- {t['name']}: {', '.join(t['accounts'])}\n"
-        for acc in t['accounts']:
-            clean_acc = acc.lstrip('@').strip()
-            if clean_acc and clean_acc not in all_accounts:
-                all_accounts.append(clean_acc)
-    
-    # xAI x_search limit: max 10 handles per request
-    allowed_handles = all_accounts[:10]
+    allowed_handles = shard['handles']
     
     # Prompt for the AI to analyze search results
     prompt = (
         f"Role: AI News Aggregator for Japanese audience.\n"
         f"Current Date: {current_date}\n\n"
-        f"Task: Search X for the LATEST updates (last 4 hours) from these AI tools/companies:\n"
+        f"Task: Search X for the LATEST updates (posted since {from_date} JST) from these AI tools/companies:\n"
         f"{tools_desc}\n"
         "INSTRUCTIONS:\n"
         "1. Search X for posts from the official accounts listed above.\n"
@@ -165,144 +275,202 @@ def get_category_news(category_name, tools_list):
                 "type": "x_search",
                 "allowed_x_handles": allowed_handles,
                 "from_date": from_date,
-                "to_date": current_date
+                "to_date": to_date or current_date
             }
         ],
         "temperature": 0.0
     }
 
     try:
-        for attempt in range(3):
-            try:
-                response = requests.post(API_URL, headers=headers, data=json.dumps(payload), timeout=180)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    try:
-                        # Responses API: output is a list
-                        # Find the 'message' type and extract text from content[].text
-                        output_list = data.get('output', [])
-                        text_content = ""
-                        
-                        for output_item in output_list:
-                            if isinstance(output_item, dict) and output_item.get('type') == 'message':
-                                content_list = output_item.get('content', [])
-                                for content_item in content_list:
-                                    if isinstance(content_item, dict) and content_item.get('type') == 'output_text':
-                                        text_content = content_item.get('text', '')
-                                        break
-                                if text_content:
-                                    break
-                        
-                        if not text_content:
-                            return "Error: No text content in API response"
-
-                        # Clean markdown fencing if present
-                        clean_json = text_content.replace("```json", "").replace("```", "").strip()
-                        return json.loads(clean_json)
-
-                    except (KeyError, json.JSONDecodeError) as e:
-                        print(f"    ⚠️ JSON Parse Error: {e}")
-                        return f"Error: Parsing failed. Raw: {str(text_content)[:200]}"
-                        
-                elif response.status_code == 429:
-                    print(f"    ⚠️ 429 Rate Limit. Sleeping 60s...")
-                    time.sleep(60)
-                    continue
-                elif response.status_code == 500:
-                    print(f"    ⚠️ 500 Server Error. Sleeping 10s and retrying...")
-                    time.sleep(10)
-                    continue
-                else:
-                    return f"Error: {response.status_code} - {response.text[:500]}"
-            except requests.exceptions.Timeout:
-                print(f"    ⚠️ Request timed out (attempt {attempt+1}/3), retrying...")
-                continue
-        return "Error: Failed after 3 retries"
-
+        data = get_xai_client().create_response(payload)
+    except XAIError as e:
+        return f"Error: {e}"
     except Exception as e:
         return f"Exception: {str(e)}"
 
+    # Responses API: output is a list; take the text of the 'message' output
+    text_content = extract_output_text(data)
+    if not text_content:
+        return "Error: No text content in API response"
 
-def process_category(category_data, report_dir):
-    """Worker function for Category Batch execution."""
-    
+    try:
+        # Clean markdown fencing if present
+        clean_json = text_content.replace("```json", "").replace("```", "").strip()
+        return json.loads(clean_json)
+    except json.JSONDecodeError as e:
+        print(f"    ⚠️ JSON Parse Error: {e}")
+        return f"Error: Parsing failed. Raw: {str(text_content)[:200]}"
+
+
+def process_category(category_data, day):
+    """
+    Worker function for Category Batch execution.
+    Returns (elapsed seconds, posts with news in the search results or None if the search failed).
+    """
+    start = time.perf_counter()
+    found = None
+    try:
+        with tracing.span("collect.category"):
+            found = _process_category(category_data, day)
+    except Exception as e:
+        print(f"  🔥 Batch Critical Failure {category_data['category']}: {e}")
+    return time.perf_counter() - start, found
+
+def _gemini_pool():
+    global _gemini_executor
+    with _GEMINI_POOL_LOCK:
+        if _gemini_executor is None:
+            _gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_CONCURRENCY, thread_name_prefix="gemini")
+        return _gemini_executor
+
+def _filter_chunk(filter_batch, chunk):
+    """Gemini stage worker: scores one chunk and frees its in-flight slot."""
+    try:
+        return filter_batch([(c['tool_name'], c['post_text'], c['why_notable']) for c in chunk])
+    finally:
+        _GEMINI_SLOTS.release()
+
+def filter_candidates(candidates):
+    """
+    Runs the Gemini filter over a category's candidates and yields (candidate, verdict) in candidate order.
+    Chunks of GEMINI_BATCH_SIZE posts are scored on the shared Gemini pool, so the caller can save and
+    deliver the first chunk while later ones are still being scored. Submitting waits while
+    GEMINI_MAX_INFLIGHT chunks (across all categories) are queued or running.
+    """
+    try:
+        from gemini_x_filter import filter_x_updates_batch, GEMINI_BATCH_SIZE
+    except ImportError as e:
+        for cand in candidates:
+            yield cand, {"error": f"Gemini filter unavailable: {e}"}
+        return
+
+    size = max(GEMINI_BATCH_SIZE, 1)
+    chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+    if GEMINI_CONCURRENCY <= 0:
+        # Sequential path: one chunk at a time in this thread
+        for chunk in chunks:
+            yield from zip(chunk, filter_x_updates_batch([(c['tool_name'], c['post_text'], c['why_notable']) for c in chunk]))
+        return
+
+    pool = _gemini_pool()
+    pending = deque()
+    submitted = 0
+    while submitted < len(chunks) or pending:
+        # Queue chunks while there is room; wait for a slot only when nothing of ours is in flight
+        if submitted < len(chunks) and _GEMINI_SLOTS.acquire(blocking=not pending):
+            chunk = chunks[submitted]
+            pending.append((chunk, pool.submit(_filter_chunk, filter_x_updates_batch, chunk)))
+            submitted += 1
+            continue
+        # Hand the oldest chunk to the ordered writer
+        chunk, future = pending.popleft()
+        yield from zip(chunk, future.result())
+
+def _process_category(category_data, day):
     cat_name = category_data['category']
     tools_list = category_data['tools']
     JST = datetime.timezone(datetime.timedelta(hours=9))
     
     print(f"📦 Batch Processing: {cat_name} ({len(tools_list)} tools)...")
     
-    try:
-        results = get_category_news(cat_name, tools_list)
-        
-        if isinstance(results, str) and results.startswith("Error"):
-             print(f"  ❌ Batch Failed: {cat_name} -> {results}")
-             return
+    progress = {}
+    results = get_category_news(cat_name, tools_list, progress)
 
-        if not isinstance(results, list):
-             print(f"  ❌ Batch Error: Expected list, got {type(results)}")
-             return
+    if isinstance(results, str) and (results.startswith("Error") or results.startswith("Exception")):
+         print(f"  ❌ Batch Failed: {cat_name} -> {results}")
+         return None
 
-        for item in results:
-            tool_name = item.get('tool_name', 'Unknown')
-            has_news = item.get('has_news', False)
-            
-            if not has_news:
-                print(f"  ⚪ {tool_name}: No news.")
-                continue
+    if not isinstance(results, list):
+         print(f"  ❌ Batch Error: Expected list, got {type(results)}")
+         return None
+
+    found = sum(1 for item in results if isinstance(item, dict) and item.get('has_news'))
 
-            post_text = item.get('post_text', '')
-            post_date = item.get('post_date', 'Unknown Date')
-            post_url = item.get('post_url', '#')
-            why_notable = item.get('why_notable', '')
-            source_type = item.get('source_type', 'unverified')
+    # Phase 1: pick candidates without any LLM call
+    candidates = []
+    for item in results:
+        tool_name = item.get('tool_name', 'Unknown')
+        has_news = item.get('has_news', False)
+        
+        if not has_news:
+            print(f"  ⚪ {tool_name}: No news.")
+            continue
+
+        post_text = item.get('post_text', '')
+        post_url = item.get('post_url', '#')
+
+        # 過去に処理済みの投稿（日付・ツール名を問わず）はLLM呼び出し前にスキップ
+        if SEEN_POSTS.contains(post_url):
+            print(f"  ⏭️ {tool_name}: Seen before. Skipping Gemini.")
+            tracing.count("collect.seen_skipped")
+            continue
+
+        # 1. 投稿URLからユニークなレポートIDを生成
+        rid = report_id(tool_name, post_url)
+
+        # 2. 既にアーカイブ済みの場合はGeminiを呼ばずにスキップ（重要：コスト削減）
+        if REPORT_STORE.exists(day, rid):
+            print(f"  ⏭️ {tool_name}: Already processed. Skipping Gemini.")
+            continue
+
+        if len(post_text) <= 15:
+            # 短すぎる投稿はニュースではないため除外
+            print(f"  ⚪ {tool_name}: Post too short ({len(post_text)} chars). Skipping.")
+            continue
+
+        # Reserve the post atomically: categories run in parallel and can share a handle (@grok)
+        if not SEEN_POSTS.claim(post_url):
+            print(f"  ⏭️ {tool_name}: Already queued (this or another category). Skipping Gemini.")
+            tracing.count("collect.seen_skipped")
+            continue
+
+        candidates.append({
+            "tool_name": tool_name,
+            "post_text": post_text,
+            "post_date": item.get('post_date', 'Unknown Date'),
+            "post_url": post_url,
+            "why_notable": item.get('why_notable', ''),
+            "source_type": item.get('source_type', 'unverified'),
+            "report_id": rid,
+        })
+
+    if not candidates:
+        commit_checkpoints(cat_name, progress)
+        return found
+
+    # Phase 2 + 3: Gemini filtering on the shared pool, then save and deliver in the original order
+    try:
+        for cand, gemini_result in filter_candidates(candidates):
+            tool_name = cand['tool_name']
+            post_text = cand['post_text']
+            post_url = cand['post_url']
 
             final_summary = post_text
-            final_why = why_notable if why_notable else "詳細をご確認ください。"
+            final_why = cand['why_notable'] if cand['why_notable'] else "詳細をご確認ください。"
             final_score = 3
             final_hook = ""
-            
-            # 1. 投稿URLからユニークなファイル名を生成
-            url_hash = hashlib.md5(post_url.encode()).hexdigest()[:8]
-            count_str = tool_name.replace(' ', '_').replace('/', '-')
-            filename = f"{count_str}_{url_hash}.json"
-            filepath = os.path.join(report_dir, filename)
-
-            # 2. 既にアーカイブ済みの場合はGeminiを呼ばずにスキップ（重要：コスト削減）
-            if os.path.exists(filepath):
-                print(f"  ⏭️ {tool_name}: Already processed. Skipping Gemini.")
+
+            if gemini_result is None:
+                # 有用なニュースと判定されなかった場合
+                SEEN_POSTS.add(post_url, tool_name, "rejected")
+                CHECKPOINTS.observe(post_url, post_date_jst(cand['post_date']), cat_name)
+                tracing.count("collect.rejected")
                 continue
 
-            if len(post_text) > 15:
-                try:
-                    from gemini_x_filter import filter_x_updates_with_gemini
-                    gemini_result = filter_x_updates_with_gemini(post_text, tool_name, why_notable)
-                    
-                    if gemini_result is None:
-                        # 有用なニュースと判定されなかった場合
-                        continue
-                    
-                    if "error" in gemini_result:
-                        print(f"  ⚠️ Gemini Skip: {gemini_result['error']}")
-                        final_summary = post_text
-                    else:
-                        final_summary = gemini_result.get('summary', post_text)
-                        final_why = gemini_result.get('why', final_why)
-                        final_score = gemini_result.get('score', 3)
-                        final_hook = gemini_result.get('hook', '')
-                except ImportError:
-                    pass
+            if "error" in gemini_result:
+                print(f"  ⚠️ Gemini Skip: {gemini_result['error']}")
+                final_summary = post_text
             else:
-                # 短すぎる投稿はニュースではないため除外
-                print(f"  ⚪ {tool_name}: Post too short ({len(post_text)} chars). Skipping.")
-                continue
+                final_summary = gemini_result.get('summary', post_text)
+                final_why = gemini_result.get('why', final_why)
+                final_score = gemini_result.get('score', 3)
+                final_hook = gemini_result.get('hook', '')
 
             print(f"  ✅ News Found: {tool_name}")
+            tracing.count("collect.reported")
 
-            # 3. JSONレポートの保存
-            
+            # 3. JSONレポートの保存（日別セグメント reports/YYYY-MM-DD.jsonl に追記）
+        
             # Improvement: Save as structured JSON instead of Markdown (Data Integrity)
             report_data = {
                 "category": cat_name,
@@ -311,37 +479,129 @@ def process_category(category_data, report_dir):
                 "why": final_why,
                 "score": final_score,
                 "hook": final_hook,
-                "source_type": source_type,
-                "post_date": post_date,
+                "source_type": cand['source_type'],
+                "post_date": cand['post_date'],
+                # Normalized once here so builds don't have to parse post_date
+                "post_date_jst": post_date_jst(cand['post_date']),
                 "url": post_url,
                 "collected_at": datetime.datetime.now(JST).isoformat()
             }
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+        
+            REPORT_STORE.append(day, cand['report_id'], report_data)
+            SEEN_POSTS.add(post_url, tool_name, "reported")
+            CHECKPOINTS.observe(post_url, report_data['post_date_jst'], cat_name)
 
             # 4. Real-time Delivery (Web & X)
             realtime_delivery(report_data)
+    finally:
+        # Claims of candidates that were not recorded (an exception above) are given back
+        for cand in candidates:
+            SEEN_POSTS.release(cand['post_url'])
 
-    except Exception as e:
-        print(f"  🔥 Batch Critical Failure {cat_name}: {e}")
-            
-    time.sleep(15) 
+    commit_checkpoints(cat_name, progress)
+    return found
+
+def commit_checkpoints(cat_name, progress):
+    """Moves the handles' checkpoints to the end of the windows whose results were fully processed."""
+    if not progress:
+        return
+    for end in sorted(set(progress.values())):
+        CHECKPOINTS.mark_searched([h for h, e in progress.items() if e == end], end)
+    CHECKPOINTS.mark_searched([], min(progress.values()), cat_name)
+    CHECKPOINTS.save()
+
+def run_collection(config, day, mode=COLLECT_MODE, concurrency=COLLECT_CONCURRENCY):
+    """Runs every category and prints wall-clock timing against the sequential estimate."""
+    durations = {}
+    start = time.perf_counter()
+
+    if mode == "sequential" or concurrency <= 1:
+        print("🐢 Sequential mode")
+        for cat in config:
+            try:
+                durations[cat['category']], _ = process_category(cat, day)
+            except Exception as exc:
+                print(f"Category exception: {exc}")
+            # No collector is writing between categories, so a quiet queue can go out now
+            DELIVERY_QUEUE.flush_if_due()
+    else:
+        print(f"⚡ Parallel mode: {concurrency} workers, {XAI_RATE_PER_MIN:g} req/min shared budget")
+        if DELIVERY_QUEUE.debounce_sec > 0:
+            # Other categories are still writing when one finishes, so there is no safe point to push
+            print("  ℹ️ DELIVERY_DEBOUNCE_SEC only applies in sequential mode: publishing once at the end")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {pool.submit(process_category, cat, day): cat['category'] for cat in config}
+            for future in as_completed(futures):
+                try:
+                    durations[futures[future]], _ = future.result()
+                except Exception as exc:
+                    print(f"Category exception: {exc}")
+
+    wall = time.perf_counter() - start
+    # Time spent waiting on the shared bucket is pacing, not work
+    busy = max(sum(durations.values()) - XAI_BUCKET.waited, 0.0)
+    sequential_estimate = busy + LEGACY_CATEGORY_SLEEP * len(config)
+
+    print("\n⏱️ Timing")
+    for name, seconds in sorted(durations.items()):
+        print(f"  {name}: {seconds:.1f}s")
+    print(f"  Wall time: {wall:.1f}s (rate-limit wait {XAI_BUCKET.waited:.1f}s, 429 pauses {XAI_BUCKET.penalties})")
+    print(f"  Sequential estimate: {sequential_estimate:.1f}s "
+          f"({busy:.1f}s work + {LEGACY_CATEGORY_SLEEP * len(config)}s legacy pacing)")
+    print(f"  Saved: {sequential_estimate - wall:.1f}s")
+    if _xai_client is not None:
+        latency = _xai_client.latency_summary()
+        if latency["requests"]:
+            print(f"  xAI: {latency['requests']} request(s), {latency['retries']} retries, "
+                  f"{latency['reused_connections']} on reused connections, "
+                  f"avg connect {latency['connect_s']['avg']:.2f}s / server {latency['server_s']['avg']:.2f}s "
+                  f"/ parse {latency['parse_s']['avg'] * 1000:.1f}ms")
+    return durations
 
 # Main Execution Block
-if __name__ == "__main__":
+def main(deliver=True):
+    """
+    Runs one collection. With deliver=False the final site build and push are left to the caller
+    (DELIVERY_QUEUE.close()), so a later stage can go out in the same commit.
+    """
     print("=== AI News Collection Start (Responses API Mode) ===")
+    if replay.REPLAY_ENABLED:
+        print("🎞️ Replay mode: xAI / Gemini / X are local fakes, git is skipped")
     
-    report_dir = setup_report_dir()
+    day = report_day()
     config = load_targets()
+
+    # Posts an earlier run could not finish (the spool does not survive a CI runner)
+    post_spool.get_worker().recover()
     
     print(f"🚀 Launching {len(config)} category agents...")
 
-    # Process categories sequentially to strictly avoid rate limits
-    for cat in config:
-        try:
-            process_category(cat, report_dir)
-        except Exception as exc:
-            print(f"Category exception: {exc}")
+    # Categories share one xAI token bucket, so parallel workers stay within the rate limit
+    run_collection(config, day)
+
+    # Post whatever is still spooled (retries and rate-limit pauses included, up to X_POST_DRAIN_SEC),
+    # before the push so the ledger update goes out with it
+    post_spool.get_worker().drain()
+
+    # One site build and one push for everything found in this run
+    if deliver:
+        DELIVERY_QUEUE.close()
+
+    gemini_filter = sys.modules.get("gemini_x_filter")
+    if gemini_filter:
+        stats = gemini_filter.get_cache_stats()
+        print(f"🧠 Gemini cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+              f"{stats['coalesced']} coalesced, hit rate {stats['hit_rate']:.0%}")
+        tracing.gauge("gemini.cache_hit_rate", stats['hit_rate'])
+    tracing.gauge("delivery.builds", DELIVERY_QUEUE.builds)
+    tracing.gauge("delivery.pushes", DELIVERY_QUEUE.pushes)
+    if _xai_client is not None:
+        tracing.gauge("xai.breaker_trips", _xai_client.breaker.trips)
+
+    # Machine-readable run report (.cache/run_reports.jsonl) + summary table
+    tracing.print_summary(tracing.write_run_report(mode=COLLECT_MODE, categories=len(config)))
 
     print("\n=== Collection Complete ===")
+
+if __name__ == "__main__":
+    main()
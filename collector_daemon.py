@@ -0,0 +1,234 @@
+"""
+Long-running collector: one warm process instead of a cold start every 4 hours.
+
+    python collector_daemon.py              # run until interrupted
+    python collector_daemon.py --ticks 3    # stop after three scheduling rounds
+
+Imports, the pooled xAI client, the Gemini client and the X client stay loaded
+for the whole run. Each category has its own schedule:
+
+- Its search windows start at its handles' checkpoints (checkpoints.py)
+  instead of a fixed 4.2 hours back. The category's high-water mark (the start
+  of its last successful poll) drives its schedule.
+- Its polling interval follows its observed news rate. Busy categories are
+  polled more often and quiet ones less often, within a request budget that
+  defaults to what the 4-hourly workflow spends (DAEMON_REQUESTS_PER_HOUR).
+
+Schedule state is kept in .cache/daemon_state.json, so a restart resumes each
+category where it left off.
+"""
+import os
+import sys
+import json
+import time
+import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import collect_ai_news as collector
+import post_spool
+from report_store import ReportStore
+import tracing
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(BASE_DIR, ".cache", "daemon_state.json")
+JST = datetime.timezone(datetime.timedelta(hours=9))
+
+# Polling interval bounds per category (minutes)
+DAEMON_MIN_INTERVAL_MIN = float(os.environ.get("DAEMON_MIN_INTERVAL_MIN", "30"))
+DAEMON_MAX_INTERVAL_MIN = float(os.environ.get("DAEMON_MAX_INTERVAL_MIN", "480"))
+# xAI requests per hour across all categories; empty = the 4-hourly workflow's rate
+DAEMON_REQUESTS_PER_HOUR = os.environ.get("DAEMON_REQUESTS_PER_HOUR", "")
+# Weight of the latest poll in the news-rate average
+RATE_SMOOTHING = 0.3
+# News per hour every category is assumed to have at least, so quiet ones are still polled
+RATE_FLOOR = 0.01
+# Days of stored reports used to seed the news rates on first start
+RATE_HISTORY_DAYS = 14
+# High-water marks are moved back by this much, for posts that show up in search late
+HWM_OVERLAP = datetime.timedelta(minutes=10)
+
+
+def plan_intervals(categories, budget_per_hour, min_hours, max_hours):
+    """
+    Polling interval (hours) per category. `categories` maps a name to (requests per poll, news rate).
+    The request budget is shared out by news rate (water-filling): categories that hit an interval
+    bound are fixed there and the rest of the budget goes to the others.
+    """
+    fixed = {}
+    while True:
+        active = {name: c for name, c in categories.items() if name not in fixed}
+        if not active:
+            return fixed
+        remaining = budget_per_hour - sum(categories[name][0] / hours for name, hours in fixed.items())
+        total_weight = sum(max(rate, RATE_FLOOR) for _, rate in active.values())
+        intervals = {}
+        for name, (requests, rate) in active.items():
+            share = remaining * max(rate, RATE_FLOOR) / total_weight
+            intervals[name] = requests / share if share > 0 else max_hours
+        clamped = {name: min(max(hours, min_hours), max_hours) for name, hours in intervals.items()
+                   if hours < min_hours or hours > max_hours}
+        if not clamped:
+            fixed.update(intervals)
+            return fixed
+        fixed.update(clamped)
+
+
+class Schedule:
+    """Per-category high-water marks, news rates and due times (persisted in STATE_FILE)."""
+
+    def __init__(self, config, path=STATE_FILE):
+        self.path = path
+        self.config = {cat['category']: cat for cat in config}
+        self.requests = {name: len(collector.plan_handle_shards(cat['tools'])) for name, cat in self.config.items()}
+        self.state = self._load()
+        self._seed_rates()
+        self.intervals = {}
+        self.replan()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("categories", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _seed_rates(self):
+        """News rate of categories seen for the first time, from the stored reports."""
+        missing = [name for name in self.config if "rate" not in self.state.get(name, {})]
+        if not missing:
+            return
+        since = (datetime.datetime.now(JST) - datetime.timedelta(days=RATE_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        counts = dict.fromkeys(missing, 0)
+        for day, _, report in ReportStore().iter_reports():
+            if day >= since and report.get('category') in counts:
+                counts[report['category']] += 1
+        for name in missing:
+            self.state.setdefault(name, {})["rate"] = counts[name] / (RATE_HISTORY_DAYS * 24)
+
+    def budget(self):
+        if DAEMON_REQUESTS_PER_HOUR:
+            return float(DAEMON_REQUESTS_PER_HOUR)
+        # Same number of requests as one run of every category each 4 hours
+        return sum(self.requests.values()) / 4.0
+
+    def replan(self):
+        self.intervals = plan_intervals(
+            {name: (self.requests[name], self.state[name]["rate"]) for name in self.config},
+            self.budget(), DAEMON_MIN_INTERVAL_MIN / 60, DAEMON_MAX_INTERVAL_MIN / 60)
+
+    def high_water_mark(self, name):
+        hwm = self.state.get(name, {}).get("hwm")
+        return datetime.datetime.fromisoformat(hwm) if hwm else None
+
+    def next_due(self, name):
+        entry = self.state.get(name, {})
+        if entry.get("retry_at"):
+            return datetime.datetime.fromisoformat(entry["retry_at"])
+        hwm = self.high_water_mark(name)
+        if hwm is None:
+            return datetime.datetime.min.replace(tzinfo=JST)
+        return hwm + HWM_OVERLAP + datetime.timedelta(hours=self.intervals[name])
+
+    def due(self, now):
+        return [name for name in self.config if self.next_due(name) <= now]
+
+    def record(self, name, started, found):
+        """Updates a category after a poll that started at `started` (found=None: the search failed)."""
+        entry = self.state.setdefault(name, {})
+        entry["polls"] = entry.get("polls", 0) + 1
+        if found is None:
+            # Keep the high-water mark: the retry's window still starts where the last good one ended
+            entry["failures"] = entry.get("failures", 0) + 1
+            entry["retry_at"] = (started + datetime.timedelta(minutes=DAEMON_MIN_INTERVAL_MIN)).isoformat(timespec="seconds")
+            return
+        entry.pop("retry_at", None)
+        window_start = self.high_water_mark(name) or started - collector.DEFAULT_WINDOW
+        hours = max((started - window_start).total_seconds() / 3600, 0.1)
+        entry["rate"] = (1 - RATE_SMOOTHING) * entry.get("rate", 0.0) + RATE_SMOOTHING * found / hours
+        entry["hwm"] = (started - HWM_OVERLAP).isoformat(timespec="seconds")
+        entry["news"] = entry.get("news", 0) + found
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"categories": self.state}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def print_plan(self, now):
+        print("🗓️ Polling plan")
+        for name in sorted(self.config):
+            wait = (self.next_due(name) - now).total_seconds() / 60
+            print(f"  {name:<28} every {self.intervals[name] * 60:>5.0f} min  "
+                  f"rate {self.state[name]['rate']:.3f}/h  next {'now' if wait <= 0 else f'in {wait:.0f} min'}")
+        total = sum(self.requests[n] / self.intervals[n] for n in self.config)
+        print(f"  xAI budget: {total:.2f} req/h planned of {self.budget():.2f} req/h")
+
+
+def warm_up():
+    """Creates the clients once, so every poll reuses them."""
+    collector.get_xai_client()
+    try:
+        import gemini_x_filter
+        gemini_x_filter._ensure_client()
+    except Exception as e:
+        print(f"  ⚠️ Gemini client not ready: {e}")
+    # The X post worker runs in the background for the whole daemon run
+    worker = post_spool.get_worker()
+    if worker.warm_up():
+        worker.recover()
+
+
+def run_tick(schedule, pool):
+    """Polls every due category. Returns the number of categories polled."""
+    now = datetime.datetime.now(JST)
+    due = schedule.due(now)
+    if due:
+        day = collector.report_day()
+        # Search windows come from the per-handle checkpoints
+        futures = {name: pool.submit(collector.process_category, schedule.config[name], day) for name in due}
+        for name, future in futures.items():
+            _, found = future.result()
+            schedule.record(name, now, found)
+        schedule.replan()
+        schedule.save()
+    # Publish whatever this round found (one build and one push); a push that failed on an
+    # earlier tick is retried here even when nothing was due
+    collector.DELIVERY_QUEUE.flush()
+    return len(due)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the collector as a long-lived process with per-category schedules.")
+    parser.add_argument("--ticks", type=int, default=0, help="stop after this many polling rounds (0 = run forever)")
+    args = parser.parse_args(argv)
+
+    print("=== AI News Collector Daemon ===")
+    config = collector.load_targets()
+    schedule = Schedule(config)
+    warm_up()
+    schedule.print_plan(datetime.datetime.now(JST))
+
+    ticks = 0
+    try:
+        with ThreadPoolExecutor(max_workers=collector.COLLECT_CONCURRENCY) as pool:
+            while True:
+                if run_tick(schedule, pool):
+                    ticks += 1
+                    schedule.print_plan(datetime.datetime.now(JST))
+                    if args.ticks and ticks >= args.ticks:
+                        break
+                now = datetime.datetime.now(JST)
+                wait = min(schedule.next_due(name) for name in schedule.config) - now
+                time.sleep(min(max(wait.total_seconds(), 1), 60))
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping daemon...")
+    finally:
+        schedule.save()
+        post_spool.get_worker().drain()
+        collector.DELIVERY_QUEUE.close()
+        tracing.print_summary(tracing.write_run_report(mode="daemon", categories=len(config), ticks=ticks))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
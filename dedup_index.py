@@ -0,0 +1,156 @@
+"""
+Persistent index of X posts that were already handled (reported, rejected or posted).
+
+    python dedup_index.py --rebuild   # backfill from reports/ and the posting ledger
+"""
+import os
+import re
+import sys
+import json
+import datetime
+import threading
+from urllib.parse import urlsplit
+from report_store import ReportStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEEN_POSTS_FILE = os.path.join(BASE_DIR, "seen_posts.jsonl")
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+POSTED_LEDGER_FILE = os.path.join(BASE_DIR, "posted_ledger.jsonl")
+POSTED_HISTORY_FILE = os.path.join(BASE_DIR, "posted_history.json")
+
+_STATUS_RE = re.compile(r'/status(?:es)?/(\d+)')
+_X_HOSTS = {"x.com", "www.x.com", "twitter.com", "www.twitter.com", "mobile.twitter.com", "mobile.x.com"}
+
+
+def normalize_post_url(url):
+    """Canonical form of a post URL: x.com host, no query/fragment, no trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host in _X_HOSTS:
+        host = "x.com"
+    return f"https://{host}{parts.path.rstrip('/')}"
+
+
+def post_key(url):
+    """Dedup key for a post: its status ID when present, else the normalized URL."""
+    if not url or not url.startswith("http"):
+        return None
+    match = _STATUS_RE.search(url)
+    if match:
+        return f"status:{match.group(1)}"
+    return f"url:{normalize_post_url(url)}"
+
+
+class SeenPostsIndex:
+    """
+    Append-only JSON-lines file, loaded once into a set for O(1) membership.
+    Safe to share between collector threads: claim() reserves a post for the
+    thread that processes it until add() records it or release() gives it up.
+    """
+
+    def __init__(self, path=SEEN_POSTS_FILE):
+        self.path = path
+        self.keys = set()
+        # Keys claimed by a collector thread but not recorded yet
+        self._claimed = set()
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            rebuild(path)
+        self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        self.keys.add(json.loads(line)["key"])
+                    except (ValueError, KeyError):
+                        continue
+
+    def __len__(self):
+        return len(self.keys)
+
+    def contains(self, url):
+        key = post_key(url)
+        return key is not None and (key in self.keys or key in self._claimed)
+
+    def claim(self, url):
+        """Reserves a post for processing. Returns False if it is recorded or claimed by someone else."""
+        key = post_key(url)
+        if key is None:
+            return True
+        with self._lock:
+            if key in self.keys or key in self._claimed:
+                return False
+            self._claimed.add(key)
+        return True
+
+    def release(self, url):
+        """Drops a claim that did not end in add() (no-op for recorded posts)."""
+        key = post_key(url)
+        with self._lock:
+            self._claimed.discard(key)
+
+    def add(self, url, tool="", status="reported"):
+        """Records a post. Returns False if it was already known."""
+        key = post_key(url)
+        if key is None:
+            return False
+        with self._lock:
+            self._claimed.discard(key)
+            if key in self.keys:
+                return False
+            self.keys.add(key)
+            entry = {"key": key, "url": url, "tool": tool, "status": status,
+                     "at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")}
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return True
+
+
+def _iter_known_posts():
+    """Yields (url, tool, status) for every post found in reports/ and the posting history."""
+    for _, _, data in ReportStore(REPORTS_DIR).iter_reports():
+        yield data.get('url', ''), data.get('tool', ''), "reported"
+
+    if os.path.exists(POSTED_LEDGER_FILE):
+        with open(POSTED_LEDGER_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)["id"], "", "posted"
+                except (ValueError, KeyError):
+                    continue
+    elif os.path.exists(POSTED_HISTORY_FILE):
+        try:
+            with open(POSTED_HISTORY_FILE, 'r', encoding='utf-8') as f:
+                for url in json.load(f):
+                    yield url, "", "posted"
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️ Skipping posting history: {e}")
+
+
+def rebuild(path=SEEN_POSTS_FILE):
+    """Rewrites the index from reports/ and the posting history. Returns the number of keys."""
+    seen = set()
+    lines = []
+    for url, tool, status in _iter_known_posts():
+        key = post_key(url)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        lines.append(json.dumps({"key": key, "url": url, "tool": tool, "status": status}, ensure_ascii=False))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("".join(line + "\n" for line in lines))
+    os.replace(tmp_path, path)
+    return len(seen)
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        count = rebuild()
+        print(f"Rebuilt {os.path.basename(SEEN_POSTS_FILE)}: {count} posts.")
+    else:
+        index = SeenPostsIndex()
+        print(f"{os.path.basename(SEEN_POSTS_FILE)}: {len(index)} posts.")
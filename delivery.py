@@ -0,0 +1,142 @@
+import os
+import datetime
+import subprocess
+import threading
+import time
+import replay
+import tracing
+from posting_ledger import get_ledger
+
+# Seconds of quiet after the last new item before an intermediate flush (run by the caller
+# between categories, never while collectors are writing). Only COLLECT_MODE=sequential has such a
+# point: in parallel mode, and with 0, everything is flushed once at the end of the run.
+DELIVERY_DEBOUNCE_SEC = float(os.environ.get("DELIVERY_DEBOUNCE_SEC", "0"))
+
+
+def rebuild_site():
+    """Rebuilds the site in-process (no fresh interpreter, no second report scan)."""
+    print("  🏗️ Rebuilding site...")
+    try:
+        from build_site import build
+        build()
+        print("  ✅ Site rebuilt.")
+        return True
+    except Exception as e:
+        print(f"  ❌ Error during site rebuild: {e}")
+        return False
+
+
+def _git(*args):
+    with tracing.span(f"git.{args[0]}"):
+        subprocess.run(["git", *args], check=True)
+
+
+def _has_staged_changes():
+    return subprocess.run(["git", "diff", "--cached", "--quiet"]).returncode != 0
+
+
+def git_sync(commit_msg):
+    """
+    Commits everything (when there are changes) and pushes, including commits an earlier
+    failed push left behind. Returns True when the push went through.
+    """
+    if replay.REPLAY_ENABLED:
+        print(f"  ⏭️ Replay mode: skipping git ({commit_msg})")
+        return True
+    print("  ☁️ Pushing to GitHub...")
+    try:
+        # The X post worker appends to the tracked ledger from its own thread: it waits until git is done
+        with get_ledger().hold():
+            # Stage only necessary files
+            _git("add", ".")
+            if _has_staged_changes():
+                _git("commit", "-m", commit_msg)
+
+            # Pull first to avoid conflicts; files written since the add are stashed around the rebase
+            _git("pull", "--rebase", "--autostash")
+            _git("push")
+        print("  🛰️ Push complete. Live at https://tadfuji.github.io/AI_TOOL_NEWS/")
+        return True
+    except Exception as e:
+        print(f"  ⚠️ Git sync noted: {e}")
+        return False
+
+
+class DeliveryQueue:
+    """
+    Collects new report items during a run and publishes them in one go:
+    a single in-process site build and a single commit/push per flush.
+    Flushes run in the caller's thread, so they never overlap the collectors' writes.
+    """
+
+    def __init__(self, debounce_sec=DELIVERY_DEBOUNCE_SEC):
+        self.debounce_sec = debounce_sec
+        self.pending = []
+        self.push_pending = False
+        self.items_total = 0
+        self.builds = 0
+        self.pushes = 0
+        self.push_failures = 0
+        self._lock = threading.RLock()
+        self._last_add = None
+
+    def add(self, item):
+        """Queues an item; restarts the debounce window."""
+        with self._lock:
+            self.pending.append(item)
+            self.items_total += 1
+            self._last_add = time.monotonic()
+
+    def due(self):
+        """True when a debounce is configured and the queue has been quiet for that long."""
+        with self._lock:
+            return bool(self.pending) and self.debounce_sec > 0 and \
+                time.monotonic() - self._last_add >= self.debounce_sec
+
+    def flush_if_due(self):
+        """Intermediate flush for callers that reach a point where no collector is writing."""
+        return self.flush() if self.due() else False
+
+    def flush(self, force=False):
+        """
+        Publishes everything queued so far. With nothing queued, retries a push that failed
+        earlier; otherwise does nothing unless `force` is set (rebuild and push anyway, e.g. after
+        the post stage updated the ledger).
+        """
+        with self._lock:
+            if not self.pending and not force:
+                if not self.push_pending:
+                    return False
+                print("📤 Retrying the last failed push")
+                # Also commits anything a failed add/commit left in the worktree
+                self._push(f"News Update: retry ({datetime.datetime.now().strftime('%H:%M')})")
+                return True
+            batch, self.pending = self.pending, []
+
+            tools = sorted({i['tool'] for i in batch})
+            print(f"📤 Publishing {len(batch)} item(s): {', '.join(tools) or '-'}")
+            if not rebuild_site():
+                # Keep the items so the end-of-run flush can retry
+                self.pending = batch + self.pending
+                return False
+            self.builds += 1
+
+            label = tools[0] if len(tools) == 1 else f"{len(batch)} items"
+            self._push(f"News Update: {label} ({datetime.datetime.now().strftime('%H:%M')})")
+            return True
+
+    def _push(self, commit_msg):
+        # A failed push stays pending, so the next flush retries it even with nothing new queued
+        self.pushes += 1
+        self.push_pending = not git_sync(commit_msg)
+        if self.push_pending:
+            self.push_failures += 1
+
+    def close(self, force=False):
+        """Final flush for the run, followed by the savings counter."""
+        self.flush(force)
+        saved_builds = max(self.items_total - self.builds, 0)
+        saved_pushes = max(self.items_total - self.pushes, 0)
+        print(f"📊 Delivery: {self.items_total} item(s), {self.builds} build(s), "
+              f"{self.pushes} push(es) ({self.push_failures} failed) "
+              f"-> saved {saved_builds} build(s) and {saved_pushes} push(es)")
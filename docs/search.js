@@ -0,0 +1,168 @@
+// Search over the prebuilt index in search/ (written by site_search.py at build time).
+// Shards are fetched newest month first, only until enough results are found.
+(function () {
+    'use strict';
+
+    // Same rules as site_search.tokenize(): ASCII words, CJK character bigrams
+    var TERM_RE = /[a-z0-9]+|[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]+/g;
+    var MAX_RESULTS = 100;
+
+    var manifest = null;
+    var shards = {};
+
+    function normalize(text) {
+        return text.normalize('NFKC').toLowerCase();
+    }
+
+    // Query parts: {word} for ASCII words (prefix match), {run, terms} for CJK runs
+    function parseQuery(query) {
+        return (normalize(query).match(TERM_RE) || []).map(function (run) {
+            if (/^[a-z0-9]+$/.test(run)) return { word: run };
+            var terms = [];
+            for (var i = 0; i < run.length - 1; i++) terms.push(run.slice(i, i + 2));
+            return { run: run, terms: terms.length ? terms : [run] };
+        });
+    }
+
+    function union(lists) {
+        var seen = {};
+        lists.forEach(function (list) { list.forEach(function (id) { seen[id] = true; }); });
+        return Object.keys(seen).map(Number);
+    }
+
+    function intersect(a, b) {
+        var inB = {};
+        b.forEach(function (id) { inB[id] = true; });
+        return a.filter(function (id) { return inB[id]; });
+    }
+
+    // Doc IDs of a shard matching every part of the query
+    function matchShard(shard, parts) {
+        var keys = Object.keys(shard.terms);
+        var result = null;
+        parts.forEach(function (part) {
+            var lists;
+            if (part.word) {
+                lists = keys.filter(function (k) { return k.lastIndexOf(part.word, 0) === 0; })
+                    .map(function (k) { return shard.terms[k]; });
+                result = result === null ? union(lists) : intersect(result, union(lists));
+                return;
+            }
+            part.terms.forEach(function (term) {
+                lists = term.length === 1
+                    ? keys.filter(function (k) { return k.indexOf(term) !== -1; }).map(function (k) { return shard.terms[k]; })
+                    : [shard.terms[term] || []];
+                result = result === null ? union(lists) : intersect(result, union(lists));
+            });
+        });
+        var columns = ['tool', 'category', 'summary', 'why'].map(function (f) { return manifest.fields.indexOf(f); });
+        // Bigrams can match out of order: keep only docs containing each run as typed
+        return (result || []).filter(function (id) {
+            var text = normalize(columns.map(function (c) { return String(shard.docs[id][c]); }).join(' '));
+            return parts.every(function (part) { return !part.run || text.indexOf(part.run) !== -1; });
+        }).sort(function (a, b) { return b - a; });
+    }
+
+    function loadShard(entry) {
+        if (!shards[entry.file]) {
+            shards[entry.file] = fetch('search/' + entry.file).then(function (r) { return r.json(); });
+        }
+        return shards[entry.file];
+    }
+
+    function el(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function card(doc) {
+        var f = manifest.fields;
+        var get = function (name) { return doc[f.indexOf(name)]; };
+        var node = el('div', 'news-card');
+        var header = el('div', 'news-header');
+        var tool = el('div', 'tool-name');
+        tool.appendChild(el('span', 'name', get('tool')));
+        header.appendChild(tool);
+        header.appendChild(el('div', 'post-date', get('display_date')));
+        node.appendChild(header);
+
+        var content = el('div', 'news-content');
+        var p = el('p');
+        p.appendChild(el('strong', '', get('summary')));
+        content.appendChild(p);
+        content.appendChild(el('div', 'why-section', get('why')));
+        node.appendChild(content);
+
+        var footer = el('div', 'news-footer');
+        var archive = el('a', 'source-link', get('date') + ' のアーカイブ');
+        archive.href = get('page');
+        var post = el('a', 'source-link', '投稿を見る');
+        post.href = get('url');
+        post.target = '_blank';
+        footer.appendChild(archive);
+        footer.appendChild(post);
+        node.appendChild(footer);
+        return node;
+    }
+
+    var searchId = 0;
+
+    function search(query) {
+        var id = ++searchId;
+        var status = document.getElementById('search-status');
+        var results = document.getElementById('search-results');
+        results.textContent = '';
+        var parts = parseQuery(query);
+        if (!parts.length) {
+            status.textContent = '';
+            return;
+        }
+        status.textContent = '検索中...';
+
+        var found = 0;
+        var entries = manifest.shards.slice();
+        function next() {
+            if (id !== searchId) return;  // A newer query took over
+            if (!entries.length || found >= MAX_RESULTS) {
+                status.textContent = found
+                    ? found + '件' + (found >= MAX_RESULTS ? '以上' : '') + '見つかりました'
+                    : '該当するニュースは見つかりませんでした。';
+                return;
+            }
+            loadShard(entries.shift()).then(function (shard) {
+                if (id !== searchId) return;
+                matchShard(shard, parts).slice(0, MAX_RESULTS - found).forEach(function (docId) {
+                    results.appendChild(card(shard.docs[docId]));
+                    found++;
+                });
+                next();
+            }, function () {
+                status.textContent = '検索インデックスを読み込めませんでした。';
+            });
+        }
+        next();
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var input = document.getElementById('search-input');
+        var timer = null;
+        fetch('search/index.json').then(function (r) { return r.json(); }).then(function (data) {
+            manifest = data;
+            var initial = new URLSearchParams(location.search).get('q');
+            if (initial) {
+                input.value = initial;
+                search(initial);
+            }
+        });
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                if (!manifest) return;
+                history.replaceState(null, '', input.value ? '?q=' + encodeURIComponent(input.value) : location.pathname);
+                search(input.value);
+            }, 200);
+        });
+    });
+})();
@@ -1,43 +1,23 @@
 import os
 import json
 import re
-from google import genai
+import hashlib
 from dotenv import load_dotenv
+from response_cache import ResponseCache, cache_key
+import replay
+import tracing
 
 load_dotenv()
 
 # Module-level client (created once, reused across calls)
 _client = None
 
-def filter_x_updates_with_gemini(raw_text: str, tool_name: str, why_notable: str = "") -> dict:
-    """
-    Filters and summarizes X updates using Gemini 3 Flash Preview.
-    Returns a dictionary with 'summary' and 'why', or None if no news found.
-    """
-    global _client
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        return {"error": "GOOGLE_API_KEY not found."}
-
-    if _client is None:
-        _client = genai.Client(api_key=api_key)
+# [IMMUTABLE] DO NOT CHANGE without user's explicit consent.
+# This specific model is chosen for its specific intelligence/behavior.
+MODEL = "gemini-3-flash-preview"
 
-    # Build optional context from Grok's initial analysis
-    notable_context = ""
-    if why_notable:
-        notable_context = f"\nInitial Analysis (from search agent): {why_notable}\n"
-
-    prompt = f"""
-Role: Expert AI Tool Analyst & Translator.
-Task: Analyze the following raw search results from X (formerly Twitter) about the AI tool "{tool_name}".
-Determine if there are any **FUNCTIONAL UPDATES** (New Features, Bug Fixes, Version Releases, Performance Improvements).
-
-Raw Search Results:
-\"\"\"
-{raw_text}
-\"\"\"
-{notable_context}
-CRITERIA (Strictly Enforced):
+# Shared by the single-post and batch prompts
+_CRITERIA = """CRITERIA (Strictly Enforced):
 1. **INCLUDE**: 
    - New capabilities (e.g., "Now you can upload PDFs")
    - Model updates (e.g., "v2.0 released")
@@ -49,9 +29,9 @@ CRITERIA (Strictly Enforced):
    - If a claim cannot be verified from official sources, note it as unconfirmed in the summary.
    - Do NOT present rumors or speculation as facts.
 
-OUTPUT FORMAT (STRICT JSON ONLY):
-If valid functional news is found, return a JSON object with exactly four keys:
-1. "summary": A clear, polite summary in GENTLE, POLITE JAPANESE (Desu/Masu tone). ~150 characters.
+"""
+
+_FIELDS = """1. "summary": A clear, polite summary in GENTLE, POLITE JAPANESE (Desu/Masu tone). ~150 characters.
 2. "why": A technical insight or user benefit. Why does this matter to developers/users? ~100 characters.
 3. "score": An integer (1-5) representing the importance of this news:
    - 5: Groundbreaking (e.g., Major model release like GPT-5, paradigm shift).
@@ -62,7 +42,21 @@ If valid functional news is found, return a JSON object with exactly four keys:
 4. "hook": A catchy, attention-grabbing 1-line phrase in Japanese (~40 chars) for social media.
    Think of it as a headline hook that makes readers want to learn more.
 
-If NO functional news is found, return exactly: {{"has_news": false}}
+"""
+
+FILTER_PROMPT_TEMPLATE = """
+Role: Expert AI Tool Analyst & Translator.
+Task: Analyze the following raw search results from X (formerly Twitter) about the AI tool "{tool_name}".
+Determine if there are any **FUNCTIONAL UPDATES** (New Features, Bug Fixes, Version Releases, Performance Improvements).
+
+Raw Search Results:
+\"\"\"
+{raw_text}
+\"\"\"
+{notable_context}
+""" + _CRITERIA + """OUTPUT FORMAT (STRICT JSON ONLY):
+If valid functional news is found, return a JSON object with exactly four keys:
+""" + _FIELDS + """If NO functional news is found, return exactly: {{"has_news": false}}
 
 Example output:
 {{
@@ -75,28 +69,194 @@ Example output:
 Return ONLY the JSON. No markdown fencing.
     """
 
-    try:
-        # [IMMUTABLE] DO NOT CHANGE without user's explicit consent.
-        # This specific model is chosen for its specific intelligence/behavior.
+BATCH_PROMPT_TEMPLATE = """
+Role: Expert AI Tool Analyst & Translator.
+Task: Analyze each of the following raw search results from X (formerly Twitter) about AI tools.
+For EACH post, determine if there are any **FUNCTIONAL UPDATES** (New Features, Bug Fixes, Version Releases, Performance Improvements).
+
+Posts (JSON list; "initial_analysis" comes from the search agent and may be empty):
+{posts_json}
+
+""" + _CRITERIA + """OUTPUT FORMAT (STRICT JSON ONLY):
+Return a JSON list with exactly one object per input post, in the same order, each carrying the post's "id".
+If valid functional news is found, the object has "id" plus exactly four keys:
+""" + _FIELDS + """If NO functional news is found for a post, its object is exactly: {{"id": <id>, "has_news": false}}
+
+Example output:
+[
+  {{"id": 0, "summary": "Google AI Studioにおいて、Gemini 1.5 Proのコンテキストウィンドウが大幅に拡張されました。", "why": "より長いコードや膨大なドキュメントを一度に処理できるようになり、開発効率が劇的に向上します。", "score": 5, "hook": "Gemini 1.5 Pro、100万トークン対応で開発が変わる"}},
+  {{"id": 1, "has_news": false}}
+]
+
+Return ONLY the JSON. No markdown fencing.
+    """
+
+# Cached answers are tied to the exact prompt template and model
+PROMPT_VERSION = hashlib.sha256((MODEL + FILTER_PROMPT_TEMPLATE + BATCH_PROMPT_TEMPLATE).encode('utf-8')).hexdigest()[:12]
+
+# Response cache (content-addressed, LRU + TTL, persisted between runs)
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "gemini_cache.json")
+CACHE_TTL_SEC = float(os.environ.get("GEMINI_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.environ.get("GEMINI_CACHE_MAX", "2000"))
+_cache = ResponseCache(CACHE_FILE, CACHE_TTL_SEC, CACHE_MAX_ENTRIES)
+
+# Posts scored per request by filter_x_updates_batch
+GEMINI_BATCH_SIZE = int(os.environ.get("GEMINI_BATCH_SIZE", "8"))
+
+def get_cache_stats():
+    """Hit/miss/coalesced counters of the Gemini response cache."""
+    return _cache.stats()
+
+def build_filter_prompt(raw_text: str, tool_name: str, why_notable: str = "") -> str:
+    # Build optional context from Grok's initial analysis
+    notable_context = ""
+    if why_notable:
+        notable_context = f"\nInitial Analysis (from search agent): {why_notable}\n"
+    return FILTER_PROMPT_TEMPLATE.format(tool_name=tool_name, raw_text=raw_text, notable_context=notable_context)
+
+@tracing.traced("gemini.filter")
+def filter_x_updates_with_gemini(raw_text: str, tool_name: str, why_notable: str = "") -> dict:
+    """
+    Filters and summarizes X updates using Gemini 3 Flash Preview.
+    Returns a dictionary with 'summary' and 'why', or None if no news found.
+    Identical requests are answered from the response cache.
+    """
+    key = cache_key(PROMPT_VERSION, raw_text, tool_name, why_notable)
+    result = _cache.get_or_compute(
+        key,
+        lambda: _call_gemini(raw_text, tool_name, why_notable),
+        cacheable=lambda value: "error" not in value,
+    )
+    return _public(result)
+
+def _ensure_client():
+    """Creates the shared client on first use. Returns an error message if it cannot."""
+    global _client
+    if replay.REPLAY_ENABLED:
+        if _client is None:
+            _client = replay.FakeGeminiClient()
+        return None
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        return "GOOGLE_API_KEY not found."
+    if _client is None:
+        # Imported on first use: google.genai is heavy and only needed for real API calls
+        from google import genai
+        _client = genai.Client(api_key=api_key)
+    return None
+
+def _generate_json(prompt):
+    """Sends one prompt and parses the JSON answer (raises on malformed output)."""
+    with tracing.span("gemini.request"):
         response = _client.models.generate_content(
-            model="gemini-3-flash-preview", 
+            model=MODEL, 
             contents=prompt
         )
-        text = response.text.strip()
-        
-        # Remove markdown fencing if present
-        clean_json = re.sub(r'```json\s*|\s*```', '', text)
-        data = json.loads(clean_json)
-        
-        if data.get("has_news") is False:
-            return None
-            
-        return {
-            "summary": data.get("summary", ""),
-            "why": data.get("why", "詳細をご確認ください。"),
-            "score": int(data.get("score", 3)),
-            "hook": data.get("hook", "")
-        }
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        tracing.add_tokens("gemini", getattr(usage, "prompt_token_count", 0), getattr(usage, "candidates_token_count", 0))
+    text = response.text.strip()
+
+    # Remove markdown fencing if present
+    clean_json = re.sub(r'```json\s*|\s*```', '', text)
+    return json.loads(clean_json)
+
+def _to_result(data):
+    """Normalizes one model answer into the cached result shape."""
+    if data.get("has_news") is False:
+        return {"has_news": False}
+
+    return {
+        "summary": data.get("summary", ""),
+        "why": data.get("why", "詳細をご確認ください。"),
+        "score": int(data.get("score", 3)),
+        "hook": data.get("hook", "")
+    }
+
+def _call_gemini(raw_text, tool_name, why_notable):
+    """Uncached Gemini call. Returns the result dict, {"has_news": False}, or {"error": ...}."""
+    error = _ensure_client()
+    if error:
+        return {"error": error}
+
+    prompt = build_filter_prompt(raw_text, tool_name, why_notable)
+
+    try:
+        return _to_result(_generate_json(prompt))
     except Exception as e:
         print(f"    ⚠️ Gemini Error: {e}")
         return {"error": str(e)}
+
+def _public(result):
+    """Cached result -> the value returned to callers (None when there is no news)."""
+    if result is None or result.get("has_news") is False:
+        return None
+    return dict(result)
+
+def _call_gemini_batch(chunk):
+    """
+    Scores a chunk of (key, (tool_name, post_text, why_notable)) in one request.
+    Returns {key: result}. Falls back to one call per post if the batch answer is malformed.
+    """
+    if len(chunk) > 1 and not _ensure_client():
+        posts_json = json.dumps(
+            [{"id": n, "tool_name": tool, "raw_text": text, "initial_analysis": why}
+             for n, (_, (tool, text, why)) in enumerate(chunk)],
+            ensure_ascii=False, indent=2,
+        )
+        try:
+            data = _generate_json(BATCH_PROMPT_TEMPLATE.format(posts_json=posts_json))
+            by_id = {}
+            for entry in data:
+                if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+                    raise ValueError(f"unexpected entry {str(entry)[:80]}")
+                if entry.get("has_news") is not False and "summary" not in entry:
+                    raise ValueError(f"entry {entry['id']} has neither summary nor has_news:false")
+                by_id[entry["id"]] = _to_result(entry)
+            if set(by_id) != set(range(len(chunk))):
+                raise ValueError(f"expected ids 0..{len(chunk) - 1}, got {sorted(by_id)}")
+            return {key: by_id[n] for n, (key, _) in enumerate(chunk)}
+        except Exception as e:
+            print(f"    ⚠️ Gemini batch of {len(chunk)} malformed ({e}). Falling back to per-post calls.")
+
+    return {key: _call_gemini(text, tool, why) for key, (tool, text, why) in chunk}
+
+@tracing.traced("gemini.filter_batch")
+def filter_x_updates_batch(posts, batch_size=GEMINI_BATCH_SIZE):
+    """
+    Batch version of filter_x_updates_with_gemini for (tool_name, post_text, why_notable) tuples.
+    Returns one result per post, in order: a result dict, None (no news) or {"error": ...}.
+    Uncached posts are scored `batch_size` at a time in a single request.
+    """
+    keys = [cache_key(PROMPT_VERSION, text, tool, why) for tool, text, why in posts]
+    resolved = {}
+    pending = []
+    owned = set()
+    waiting = {}
+    for key, post in zip(keys, posts):
+        if key in resolved or key in waiting or key in owned:
+            continue
+        # Keys another caller is already scoring are waited for instead of sent again
+        state, value = _cache.begin(key)
+        if state == "hit":
+            resolved[key] = value
+        elif state == "wait":
+            waiting[key] = value
+        else:
+            owned.add(key)
+            pending.append((key, post))
+
+    batch_size = max(int(batch_size), 1)
+    try:
+        for start in range(0, len(pending), batch_size):
+            for key, result in _call_gemini_batch(pending[start:start + batch_size]).items():
+                resolved[key] = result
+    finally:
+        # Owned keys are always released, so waiting callers never hang
+        for key, _ in pending:
+            _cache.finish(key, resolved.get(key), cacheable=lambda value: "error" not in value)
+
+    for key, waiter in waiting.items():
+        resolved[key] = _cache.wait(waiter) or {"error": "concurrent Gemini request failed"}
+
+    return [_public(resolved[key]) for key in keys]
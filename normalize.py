@@ -0,0 +1,143 @@
+"""
+Shared text normalization for report summaries (used by build_site.py and post_to_x.py).
+
+Patterns are compiled once, each line is scanned in a single pass for dates and
+URLs, and results are memoized by content, so a summary seen again (every build,
+or by both the builder and the poster) is never re-tokenized.
+
+Post dates take a fast path for the formats the collector asks for
+("YYYY-MM-DD HH:MM", optionally with seconds or a UTC offset); dateutil is
+imported only for anything else.
+"""
+import re
+import datetime
+from functools import lru_cache
+
+# Line prefixes left over from older report formats / model output
+_MARKER_RE = re.compile(r'^(?:- )?(?:Post|Time|URL|\*\*Date\*\*|\*\*Summary\*\*|\*\*URL\*\*):', re.IGNORECASE)
+_URL_RE = re.compile(r'https?://\S+')
+_DATE = r'\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2})?'
+# One token per match: a URL (dates inside it, with their time, belong to it), or a date
+_TOKEN_RE = re.compile(rf'https?://(?:{_DATE}|\S)+|{_DATE}')
+
+NO_NEWS_MARKER = "No significant news found"
+
+
+@lru_cache(maxsize=8192)
+def clean_summary_text(text, url=None, date=None):
+    """
+    Strips markdown markers, dates and URLs from summary text.
+    Returns (summary, embedded_urls) where embedded_urls is a tuple in text order.
+    """
+    embedded_urls = tuple(_URL_RE.findall(text))
+
+    summary_lines = []
+    for line in text.split('\n'):
+        clean_line = _MARKER_RE.sub('', line.strip()).strip()
+        if not clean_line:
+            continue
+        # Skip if line is JUST a date or JUST a URL
+        if (url and clean_line == url) or (date and clean_line == date):
+            continue
+        clean_line = _TOKEN_RE.sub('', clean_line).strip()
+        if clean_line:
+            summary_lines.append(clean_line)
+
+    summary = " ".join(summary_lines).replace("**", "").strip()
+    summary = summary.replace("  ", " ")
+    return summary, embedded_urls
+
+
+def reference_url(embedded_urls, url):
+    """First embedded URL when it points somewhere other than the post itself."""
+    return embedded_urls[0] if embedded_urls and embedded_urls[0] != url else None
+
+
+def is_no_news(summary):
+    return NO_NEWS_MARKER in summary
+
+
+JST = datetime.timezone(datetime.timedelta(hours=9))
+_TZ_NAME_RE = re.compile(r'\(?(GMT|UTC|JST)\)?')
+_FAST_DATE_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?\s*(Z|[+-]\d{2}:?\d{2})?')
+_ISO_DAY_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
+def _parse_fast(text):
+    """datetime for the known formats, or None to fall back to dateutil."""
+    match = _FAST_DATE_RE.fullmatch(text)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, offset = match.groups()
+    tz = datetime.timezone.utc
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        tz = datetime.timezone(sign * datetime.timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+    try:
+        return datetime.datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                                 int(second or 0), tzinfo=tz)
+    except ValueError:
+        return None
+
+
+def _parse_dateutil(text):
+    from dateutil import parser
+    dt = parser.parse(text)
+    if dt.tzinfo is None:
+        # Naive times from the collector are UTC
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt
+
+
+@lru_cache(maxsize=8192)
+def parse_post_date(date_raw):
+    """The post time in JST, or None if it cannot be parsed. Memoized per raw string."""
+    clean_date = _TZ_NAME_RE.sub('', date_raw).strip()
+    dt = _parse_fast(clean_date)
+    if dt is None:
+        try:
+            dt = _parse_dateutil(clean_date)
+        except (ValueError, TypeError, OverflowError):
+            return None
+    return dt.astimezone(JST)
+
+
+def date_fields(dt_jst):
+    """(date, sort_date, display_date) for a JST datetime."""
+    date = f"{dt_jst.year:04d}-{dt_jst.month:02d}-{dt_jst.day:02d}"
+    time = f"{dt_jst.hour:02d}:{dt_jst.minute:02d}"
+    display = f"{dt_jst.year:04d}年{dt_jst.month:02d}月{dt_jst.day:02d}日 {dt_jst.hour:02d}時{dt_jst.minute:02d}分"
+    return date, f"{date} {time}", display
+
+
+@lru_cache(maxsize=8192)
+def normalize_post_date(date_raw, post_date_jst=None):
+    """
+    (date, sort_date, display_date) for a report.
+    post_date_jst (stored by the collector) skips parsing; unparseable dates keep the raw string.
+    """
+    if post_date_jst:
+        try:
+            return date_fields(datetime.datetime.fromisoformat(post_date_jst).astimezone(JST))
+        except ValueError:
+            pass
+    dt_jst = parse_post_date(date_raw)
+    if dt_jst is not None:
+        return date_fields(dt_jst)
+
+    match = _ISO_DAY_RE.search(date_raw)
+    if match:
+        item_date = match.group(1)
+    elif date_raw != "Unknown Date" and len(date_raw) >= 10:
+        item_date = date_raw[:10]
+    else:
+        item_date = "Unknown Date"
+    return item_date, date_raw, date_raw
+
+
+def post_date_jst(date_raw):
+    """ISO-8601 JST timestamp stored with each report at collection time (None if unparseable)."""
+    dt_jst = parse_post_date(date_raw)
+    return dt_jst.isoformat(timespec="minutes") if dt_jst is not None else None
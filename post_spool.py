@@ -0,0 +1,373 @@
+"""
+Outbound X posts: a durable spool (.cache/post_spool.sqlite3) and the worker draining it.
+
+The collector only enqueues; a background worker posts in enqueue order, so a slow
+or rate-limited X API no longer holds up collection. Per post the spool keeps its
+state (queued / sending / posted / failed), attempts, next attempt time and last
+error, so nothing is lost when a post fails or the process stops. On a CI runner
+the spool itself is gone after the run; recover() re-queues the recent reports
+that the (committed) ledger does not have at the start of the next run.
+
+- Rate limits: when the response headers (or a 429) say a window is used up, all
+  posting pauses until its reset time. Other retryable failures (5xx, network)
+  back off exponentially per post, up to X_POST_MAX_ATTEMPTS attempts.
+- The posting ledger is updated in batches (every X_LEDGER_FLUSH_EVERY posts, at
+  the latest X_LEDGER_FLUSH_SEC after a post, and when draining). Posts already in
+  the spool as posted are never sent twice, even before their ledger flush.
+
+    python post_spool.py                 # spool status and failed posts
+    python post_spool.py --retry-failed  # queue failed posts again
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import post_to_x
+from posting_ledger import get_ledger
+import tracing
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPOOL_FILE = os.path.join(BASE_DIR, ".cache", "post_spool.sqlite3")
+
+# Attempts per post before it is marked failed
+X_POST_MAX_ATTEMPTS = int(os.environ.get("X_POST_MAX_ATTEMPTS", "5"))
+# First retry delay (seconds); doubles per attempt up to X_POST_MAX_BACKOFF_SEC
+X_POST_BACKOFF_SEC = float(os.environ.get("X_POST_BACKOFF_SEC", "30"))
+X_POST_MAX_BACKOFF_SEC = 900
+# How long the end of a run waits for queued posts (retries and rate-limit pauses included)
+X_POST_DRAIN_SEC = float(os.environ.get("X_POST_DRAIN_SEC", "300"))
+# Ledger flushes: after this many posts, or this many seconds after the oldest unflushed post
+X_LEDGER_FLUSH_EVERY = int(os.environ.get("X_LEDGER_FLUSH_EVERY", "10"))
+X_LEDGER_FLUSH_SEC = float(os.environ.get("X_LEDGER_FLUSH_SEC", "30"))
+# A post left in "sending" this long (crashed process) is retried
+SENDING_LEASE_SEC = 120
+# Posted rows are pruned after this many days
+KEEP_POSTED_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    item TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    tweet_id TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    recorded INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS posts_due ON posts (state, next_attempt);
+"""
+
+
+class PostSpool:
+    """SQLite-backed queue of outbound posts, safe to share between threads and processes."""
+
+    def __init__(self, path=SPOOL_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.execute("DELETE FROM posts WHERE state = 'posted' AND recorded = 1 AND updated_at < ?",
+                         (time.time() - KEEP_POSTED_DAYS * 86400,))
+
+    def _execute(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args)
+
+    def enqueue(self, item, now=None):
+        """Queues an item (its 'id' is the ledger key). Returns False if it is already in the spool."""
+        now = time.time() if now is None else now
+        cursor = self._execute(
+            "INSERT OR IGNORE INTO posts (id, item, next_attempt, enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (item['id'], json.dumps(item, ensure_ascii=False), now, now, now))
+        return cursor.rowcount == 1
+
+    def claim(self, now=None):
+        """Takes the oldest due post (marks it sending). Returns (id, item, attempts) or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id, item, attempts FROM posts WHERE (state = 'queued' AND next_attempt <= ?) "
+                    "OR (state = 'sending' AND next_attempt <= ?) ORDER BY next_attempt, seq LIMIT 1",
+                    (now, now - SENDING_LEASE_SEC)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE posts SET state = 'sending', attempts = attempts + 1, "
+                                     "next_attempt = ?, updated_at = ? WHERE id = ?", (now, now, row[0]))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2] + 1
+
+    def mark_posted(self, post_id, tweet_id, recorded=False):
+        self._execute("UPDATE posts SET state = 'posted', tweet_id = ?, error = NULL, recorded = ?, updated_at = ? "
+                      "WHERE id = ?", (tweet_id, int(recorded), time.time(), post_id))
+
+    def mark_retry(self, post_id, error, next_attempt):
+        self._execute("UPDATE posts SET state = 'queued', error = ?, next_attempt = ?, updated_at = ? WHERE id = ?",
+                      (error, next_attempt, time.time(), post_id))
+
+    def mark_failed(self, post_id, error):
+        self._execute("UPDATE posts SET state = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                      (error, time.time(), post_id))
+
+    def unrecorded(self):
+        """[(id, tweet_id, posted at)] of posts not yet in the ledger, oldest first."""
+        return self._execute("SELECT id, tweet_id, updated_at FROM posts WHERE state = 'posted' AND recorded = 0 "
+                             "ORDER BY seq").fetchall()
+
+    def mark_recorded(self, post_ids):
+        with self._lock:
+            self._db.executemany("UPDATE posts SET recorded = 1 WHERE id = ?", [(i,) for i in post_ids])
+
+    def next_due(self):
+        """Epoch seconds of the next queued post, or None when nothing is queued."""
+        row = self._execute("SELECT MIN(next_attempt) FROM posts WHERE state IN ('queued', 'sending')").fetchone()
+        return row[0]
+
+    def counts(self):
+        rows = self._execute("SELECT state, COUNT(*) FROM posts GROUP BY state").fetchall()
+        return {state: n for state, n in rows}
+
+    def failed(self):
+        return self._execute("SELECT id, attempts, error FROM posts WHERE state = 'failed' ORDER BY seq").fetchall()
+
+    def retry_failed(self):
+        now = time.time()
+        return self._execute("UPDATE posts SET state = 'queued', attempts = 0, next_attempt = ?, updated_at = ? "
+                             "WHERE state = 'failed'", (now, now)).rowcount
+
+
+class PostWorker:
+    """Posts spooled items in a background thread (start) or in the caller's thread (drain)."""
+
+    def __init__(self, spool=None, client_factory=post_to_x.get_twitter_client):
+        self.spool = spool or PostSpool()
+        self.client_factory = client_factory
+        self.client = None
+        self._no_client = False
+        self.paused_until = 0.0
+        self.posted = self.retried = self.failed = self.flushes = 0
+        self._oldest_unflushed = None
+        self._unflushed = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def warm_up(self):
+        """Creates the X client now. Returns False when it cannot (missing credentials)."""
+        if self.client is None and not self._no_client:
+            self.client = self.client_factory()
+            if self.client is None:
+                self._no_client = True
+                print("  ⚠️ X client unavailable: posts stay queued in the spool.")
+        return self.client is not None
+
+    # --- producer side ---
+
+    def recover(self):
+        """
+        Queues recent reports the ledger does not have. The spool lives in .cache/, which does not
+        survive a CI runner, so posts a previous run left queued or failed are rebuilt from the
+        committed reports and ledger instead.
+        """
+        queued = post_to_x.queue_unposted(self.spool)
+        if queued:
+            print(f"📮 Re-queued {queued} unposted item(s) from recent reports.")
+            self.start()
+            self._wake.set()
+        return queued
+
+    def enqueue(self, item):
+        """Queues an item and wakes the background worker (started on first use)."""
+        if item['id'] in get_ledger():
+            return False
+        queued = self.spool.enqueue(item)
+        if queued:
+            tracing.count("x.queued")
+            self.start()
+            self._wake.set()
+        return queued
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="x-poster", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = self.process_due()
+            self._wake.wait(timeout=min(wait, 30))
+            self._wake.clear()
+
+    # --- posting ---
+
+    def process_due(self):
+        """Posts every due item. Returns seconds until there may be more to do."""
+        while not self._stop.is_set():
+            now = time.time()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if not self.warm_up():
+                return 3600
+            claimed = self.spool.claim(now)
+            if claimed is None:
+                break
+            self._post(*claimed)
+        self.flush_ledger()
+        next_due = self.spool.next_due()
+        wait = 3600 if next_due is None else next_due - time.time()
+        if self._oldest_unflushed is not None:
+            wait = min(wait, self._oldest_unflushed + X_LEDGER_FLUSH_SEC - time.time())
+        return max(wait, 0.05)
+
+    def _post(self, post_id, item, attempt):
+        if post_id in get_ledger():
+            self.spool.mark_posted(post_id, None, recorded=True)
+            return
+        try:
+            with tracing.span("x.post"):
+                tweet_id, headers = post_to_x.send_tweet(item, self.client)
+        except Exception as e:
+            self._failed(post_id, item, attempt, e)
+            return
+        print(f"  -> Posted to X! Tweet ID: {tweet_id} ({item['tool']})")
+        self.spool.mark_posted(post_id, tweet_id)
+        self.posted += 1
+        self._unflushed += 1
+        if self._oldest_unflushed is None:
+            self._oldest_unflushed = time.time()
+        tracing.count("x.posted")
+        reset = post_to_x.rate_limit_reset(headers)
+        if reset is not None:
+            self._pause(reset, "window used up")
+
+    def _failed(self, post_id, item, attempt, error):
+        status = post_to_x.error_status(error)
+        # Other 4xx (duplicate post, auth) will not succeed on retry
+        retryable = status is None or status == 429 or status >= 500
+        if not retryable or attempt >= X_POST_MAX_ATTEMPTS:
+            print(f"  -> Failed to post to X ({item['tool']}, attempt {attempt}): {error}")
+            self.spool.mark_failed(post_id, str(error))
+            self.failed += 1
+            tracing.count("x.failed")
+            return
+        next_attempt = time.time() + min(X_POST_BACKOFF_SEC * 2 ** (attempt - 1), X_POST_MAX_BACKOFF_SEC)
+        if status == 429:
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            reset = post_to_x.rate_limit_reset(headers) or float(headers.get("x-rate-limit-reset") or 0)
+            next_attempt = self._pause(reset or next_attempt, "429")
+            tracing.count("x.rate_limited")
+        print(f"  -> X post deferred ({item['tool']}, attempt {attempt}): {error} "
+              f"- retry in {max(next_attempt - time.time(), 0):.0f}s")
+        self.spool.mark_retry(post_id, str(error), next_attempt)
+        self.retried += 1
+        tracing.count("x.retried")
+
+    def _pause(self, until, reason):
+        """Pauses all posting until `until` (epoch seconds, one second of margin). Returns the resume time."""
+        self.paused_until = max(self.paused_until, until + 1)
+        print(f"  ⏸️ X rate limit ({reason}): posting paused for {max(self.paused_until - time.time(), 0):.0f}s")
+        return self.paused_until
+
+    # --- ledger ---
+
+    def flush_ledger(self, force=False):
+        """Writes posted items to the ledger in one append once enough of them (or enough time) piled up."""
+        if not self._unflushed and not force:
+            return 0
+        if not force and self._unflushed < X_LEDGER_FLUSH_EVERY and \
+                time.time() - self._oldest_unflushed < X_LEDGER_FLUSH_SEC:
+            return 0
+        rows = self.spool.unrecorded()
+        if rows:
+            get_ledger().record_many([(post_id, tweet_id) for post_id, tweet_id, _ in rows])
+            self.spool.mark_recorded([post_id for post_id, _, _ in rows])
+            self.flushes += 1
+        self._unflushed = 0
+        self._oldest_unflushed = None
+        return len(rows)
+
+    # --- shutdown ---
+
+    def drain(self, timeout=X_POST_DRAIN_SEC):
+        """
+        Posts everything queued in the caller's thread, waiting out retries and rate-limit pauses for
+        up to `timeout` seconds, then flushes the ledger. Posts still queued stay in the spool.
+        """
+        self.stop()
+        deadline = time.monotonic() + timeout
+        self._stop.clear()
+        while True:
+            wait = self.process_due()
+            counts = self.spool.counts()
+            queued = counts.get("queued", 0) + counts.get("sending", 0)
+            if not queued or self.client is None:
+                break
+            if time.monotonic() + wait > deadline:
+                print(f"  ⏳ {queued} post(s) still waiting (next attempt in {wait:.0f}s): left in the spool.")
+                break
+            time.sleep(wait)
+        self.flush_ledger(force=True)
+        self.print_summary()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def print_summary(self):
+        counts = self.spool.counts()
+        print(f"📮 X posts: {self.posted} posted, {self.retried} retried, {self.failed} failed this run; "
+              f"spool: {counts.get('queued', 0) + counts.get('sending', 0)} queued, "
+              f"{counts.get('failed', 0)} failed ({self.flushes} ledger flush(es))")
+        tracing.gauge("x.ledger_flushes", self.flushes)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """Process-wide post worker, created on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = PostWorker()
+        return _worker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or reset the outbound X post spool.")
+    parser.add_argument("--retry-failed", action="store_true", help="queue failed posts again")
+    args = parser.parse_args(argv)
+
+    spool = PostSpool()
+    if args.retry_failed:
+        print(f"Queued {spool.retry_failed()} failed post(s) again (post them with: python post_to_x.py).")
+    counts = spool.counts()
+    print(", ".join(f"{state}: {n}" for state, n in sorted(counts.items())) or "Spool is empty.")
+    for post_id, attempts, error in spool.failed():
+        print(f"  ❌ {post_id} ({attempts} attempt(s)): {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
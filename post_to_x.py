@@ -1,164 +1,138 @@
 import os
-import json
-import glob
 import re
 import datetime
-import tweepy
 from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configuration
-POSTED_HISTORY_FILE = "posted_history.json"
-REPORTS_DIR = "reports"
-
-# X API Credentials (from Environment Variables)
-CONSUMER_KEY = os.environ.get("X_CONSUMER_KEY")
-CONSUMER_SECRET = os.environ.get("X_CONSUMER_SECRET")
-ACCESS_TOKEN = os.environ.get("X_ACCESS_TOKEN")
-ACCESS_TOKEN_SECRET = os.environ.get("X_ACCESS_TOKEN_SECRET")
-
-def load_history():
-    """Loads the history of posted news URLs/IDs."""
-    if os.path.exists(POSTED_HISTORY_FILE):
-        try:
-            with open(POSTED_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
-    return []
-
-def save_history(history):
-    """Saves the updated history."""
-    with open(POSTED_HISTORY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
+from posting_ledger import get_ledger
+from report_store import ReportStore
+import replay
+from normalize import clean_summary_text, is_no_news
 
 def get_twitter_client():
     """Initializes and returns the Tweepy Client for X API v2."""
+    if replay.REPLAY_ENABLED:
+        return replay.FakeXClient()
+
+    # Load environment variables from .env file (only when a client is actually needed)
+    load_dotenv()
+    # X API Credentials (from Environment Variables)
+    CONSUMER_KEY = os.environ.get("X_CONSUMER_KEY")
+    CONSUMER_SECRET = os.environ.get("X_CONSUMER_SECRET")
+    ACCESS_TOKEN = os.environ.get("X_ACCESS_TOKEN")
+    ACCESS_TOKEN_SECRET = os.environ.get("X_ACCESS_TOKEN_SECRET")
     if not all([CONSUMER_KEY, CONSUMER_SECRET, ACCESS_TOKEN, ACCESS_TOKEN_SECRET]):
         print("Warning: Missing X API credentials. Skipping posting.")
         return None
 
     try:
+        # Imported on first use: tweepy is heavy and only needed when posting
+        import tweepy
+        import requests
         client = tweepy.Client(
             consumer_key=CONSUMER_KEY,
             consumer_secret=CONSUMER_SECRET,
             access_token=ACCESS_TOKEN,
-            access_token_secret=ACCESS_TOKEN_SECRET
+            access_token_secret=ACCESS_TOKEN_SECRET,
+            # Raw responses, so the rate-limit headers are visible (see send_tweet)
+            return_type=requests.Response
         )
         return client
     except Exception as e:
         print(f"Error initializing X Client: {e}")
         return None
 
-def parse_report_file(filepath):
-    """Parses a JSON report file to extract news items."""
-    items = []
-    
-    if filepath.endswith('.json'):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            tool_name = data.get('tool', 'Unknown')
-            category = data.get('category', 'AI News')
-            url = data.get('url', '')
-            summary_raw = data.get('summary', '')
-
-            # Extract clean summary from Gemini's markdown output if present
-            summary = summary_raw
-            if "**Summary**:" in summary_raw:
-                s_match = re.search(r'\*\*Summary\*\*:\s*(.*)', summary_raw, re.DOTALL)
-                if s_match:
-                    summary = s_match.group(1).strip()
-            
-            # Final cleanup
-            summary = summary.replace("**", "").replace("- ", "").strip()
-            # Remove any trailing "URL: ..." or "Date: ..." if they leaked in
-            summary = re.split(r'\n(URL|Date|Time):', summary)[0].strip()
-
-            if "No significant news found" in summary:
-                return []
-
-            if len(summary) > 5 and url.startswith("http"):
-                items.append({
-                    "tool": tool_name,
-                    "category": category,
-                    "summary": summary,
-                    "hook": data.get('hook', ''),
-                    "url": url,
-                    "id": url
-                })
-        except Exception as e:
-            print(f"Error parsing JSON {filepath}: {e}")
-        return items
-
-    # Note: Legacy Markdown format is no longer supported.
-    # All reports are now stored as JSON (since 2026-01-29 JSON Pivot).
-    return items
-
-def post_item_to_x(item, client=None):
-    """Posts a single news item to X."""
-    if not client:
-        client = get_twitter_client()
-    if not client:
-        return False
-
-    history = load_history()
-    if item['id'] in history:
-        return False
+def parse_report(data):
+    """Extracts the postable news items from one report."""
+    tool_name = data.get('tool', 'Unknown')
+    category = data.get('category', 'AI News')
+    url = data.get('url', '')
+    summary_raw = data.get('summary', '')
+
+    # Same cleanup as the site (markers, dates and URLs stripped)
+    summary, _ = clean_summary_text(summary_raw, url, data.get('post_date', 'Unknown Date'))
+
+    if is_no_news(summary):
+        return []
+
+    if len(summary) > 5 and url.startswith("http"):
+        return [{
+            "tool": tool_name,
+            "category": category,
+            "summary": summary,
+            "hook": data.get('hook', ''),
+            "url": url,
+            "id": url
+        }]
+    return []
+
+# (remaining, reset) header pairs sent with tweet creation: the endpoint window and the per-user 24h cap
+_RATE_LIMIT_HEADERS = (("x-rate-limit-remaining", "x-rate-limit-reset"),
+                       ("x-user-limit-24hour-remaining", "x-user-limit-24hour-reset"))
+_STATUS_RE = re.compile(r'^(\d{3}) ')
 
+def format_tweet(item):
     # Use hook for engaging intro, fall back to standard format
     hook = item.get('hook', '')
     if hook:
-        tweet_text = f"\U0001f525 {hook}\n\n{item['summary']}\n\n{item['url']}\n#AI #{item['category'].replace(' ', '')}"
-    else:
-        tweet_text = f"\U0001f4e2 {item['tool']} Update!\n\n{item['summary']}\n\n{item['url']}\n#AI #{item['category'].replace(' ', '')}"
-
-    try:
-        response = client.create_tweet(text=tweet_text)
-        print(f"  -> Posted to X! Tweet ID: {response.data['id']}")
-        
-        history.append(item['id'])
-        save_history(history)
-        return True
-    except Exception as e:
-        print(f"  -> Failed to post to X: {e}")
-        return False
+        return f"\U0001f525 {hook}\n\n{item['summary']}\n\n{item['url']}\n#AI #{item['category'].replace(' ', '')}"
+    return f"\U0001f4e2 {item['tool']} Update!\n\n{item['summary']}\n\n{item['url']}\n#AI #{item['category'].replace(' ', '')}"
+
+def send_tweet(item, client):
+    """Posts one item. Returns (tweet ID, response headers); raises on failure."""
+    response = client.create_tweet(text=format_tweet(item))
+    if hasattr(response, "json"):
+        # requests.Response (see get_twitter_client)
+        return str(response.json()["data"]["id"]), response.headers
+    return str(response.data["id"]), {}
+
+def error_status(error):
+    """HTTP status of a failed create_tweet call (tweepy.HTTPException or replay fault), or None."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        match = _STATUS_RE.match(str(error))
+        status = int(match.group(1)) if match else None
+    return status
+
+def rate_limit_reset(headers):
+    """Epoch seconds until which posting has to pause when a rate-limit window is used up, else None."""
+    resets = [float(headers[reset]) for remaining, reset in _RATE_LIMIT_HEADERS
+              if str(headers.get(remaining, "")).strip() == "0" and headers.get(reset)]
+    return max(resets) if resets else None
+
+def queue_unposted(spool, days=None):
+    """
+    Adds report items of `days` (default: today and yesterday, JST) that the ledger does not have
+    to the post spool. Returns how many were added.
+    """
+    if days is None:
+        JST = datetime.timezone(datetime.timedelta(hours=9))
+        now = datetime.datetime.now(JST)
+        days = [now.strftime("%Y-%m-%d"), (now - datetime.timedelta(days=1)).strftime("%Y-%m-%d")]
+    ledger = get_ledger()
+    queued = 0
+    for _, _, data in ReportStore().iter_reports(days=days):
+        for item in parse_report(data):
+            if item['id'] not in ledger and spool.enqueue(item):
+                queued += 1
+    return queued
 
 def main():
+    """Queues today's and yesterday's unposted report items in the post spool and drains it."""
+    import post_spool
     print("=== X Auto-Post Start ===")
-    
-    client = get_twitter_client()
-    if not client:
+
+    worker = post_spool.get_worker()
+    if not worker.warm_up():
         print("Skipping X posting due to missing credentials.")
         return
 
-    history = load_history()
-    print(f"Loaded {len(history)} previously posted items.")
-    
-    JST = datetime.timezone(datetime.timedelta(hours=9))
-    today_str = datetime.datetime.now(JST).strftime("%Y-%m-%d")
-    yesterday_str = (datetime.datetime.now(JST) - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
-    target_dirs = [today_str, yesterday_str]
-    
-    all_reports = []
-    for d in target_dirs:
-        day_path = os.path.join(REPORTS_DIR, d)
-        if os.path.exists(day_path):
-            all_reports.extend(glob.glob(os.path.join(day_path, "*.json")))
+    ledger = get_ledger()
+    print(f"Loaded {len(ledger)} previously posted items.")
 
-    new_items_count = 0
-    
-    for report_path in all_reports:
-        items = parse_report_file(report_path)
-        for item in items:
-            if post_item_to_x(item, client):
-                new_items_count += 1
-                
-    if new_items_count == 0:
+    if queue_unposted(worker.spool) == 0:
         print("No new items to post.")
+
+    # Also posts anything an earlier run left in the spool
+    worker.drain()
     
     print("=== X Auto-Post Complete ===")
 
@@ -0,0 +1,181 @@
+"""
+Append-only ledger of items posted to X (one JSON object per line).
+
+Replaces the posted_history.json list: the ledger is read once per process into a
+set, each post appends one line, and duplicates are compacted away periodically.
+Appends take an inter-process file lock, so parallel collectors can share it.
+"""
+import os
+import json
+import datetime
+import threading
+import contextlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_FILE = os.path.join(BASE_DIR, "posted_ledger.jsonl")
+LEGACY_HISTORY_FILE = os.path.join(BASE_DIR, "posted_history.json")
+# Compact after this many appends by one process
+COMPACT_EVERY = 500
+
+try:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _FileLock:
+    """Exclusive lock on `<ledger>.lock`, shared by every process using the ledger."""
+
+    def __init__(self, path):
+        self.path = f"{path}.lock"
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.path, 'a+')
+        _lock_file(self._f)
+        return self
+
+    def __exit__(self, *exc):
+        _unlock_file(self._f)
+        self._f.close()
+        self._f = None
+
+
+class PostingLedger:
+    def __init__(self, path=LEDGER_FILE, legacy_path=LEGACY_HISTORY_FILE):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._file_lock = _FileLock(path)
+        self._offset = 0
+        self._inode = None
+        self._lines = 0
+        self._appended = 0
+        with self._file_lock:
+            if not os.path.exists(path):
+                self._migrate(legacy_path)
+            self._read_new_entries()
+            if self._lines > len(self.entries) * 1.2 + 50:
+                self._compact_locked()
+
+    def _migrate(self, legacy_path):
+        """Seeds the ledger from the old posted_history.json list (no tweet IDs recorded there)."""
+        history = []
+        if os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, 'r', encoding='utf-8') as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                history = []
+        seen = set()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for post_id in history:
+                if post_id in seen:
+                    continue
+                seen.add(post_id)
+                f.write(json.dumps({"id": post_id, "tweet_id": None, "posted_at": None}, ensure_ascii=False) + "\n")
+        if history:
+            print(f"Migrated {len(seen)} posts from {os.path.basename(legacy_path)} to {os.path.basename(self.path)}.")
+
+    def _read_new_entries(self):
+        """Reads lines appended since the last read (everything after a compaction by another process)."""
+        if not os.path.exists(self.path):
+            return
+        inode = os.stat(self.path).st_ino
+        if inode != self._inode:
+            self.entries, self._offset, self._lines, self._inode = {}, 0, 0, inode
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partially written line; pick it up next time
+                self._offset += len(raw)
+                self._lines += 1
+                try:
+                    entry = json.loads(raw)
+                    self.entries[entry["id"]] = entry
+                except (ValueError, KeyError):
+                    continue
+
+    def __contains__(self, post_id):
+        return post_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, post_id, tweet_id=None):
+        """Appends one posted item. Returns False if another writer already recorded it."""
+        return self.record_many([(post_id, tweet_id)]) == 1
+
+    def record_many(self, posts):
+        """Appends several (post_id, tweet_id) pairs under one lock. Returns how many were new."""
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        with self._lock, self._file_lock:
+            self._read_new_entries()
+            lines = []
+            for post_id, tweet_id in posts:
+                if post_id in self.entries:
+                    continue
+                entry = {"id": post_id, "tweet_id": tweet_id, "posted_at": now}
+                self.entries[post_id] = entry
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            if lines:
+                data = "".join(lines).encode('utf-8')
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+                self._offset += len(data)
+                self._lines += len(lines)
+                self._appended += len(lines)
+                if self._appended >= COMPACT_EVERY:
+                    self._compact_locked()
+            return len(lines)
+
+    @contextlib.contextmanager
+    def hold(self):
+        """Blocks appends from every thread and process, e.g. while git commits and rebases the file."""
+        with self._lock, self._file_lock:
+            yield self
+
+    def compact(self):
+        """Rewrites the ledger with one line per posted item."""
+        with self._lock, self._file_lock:
+            self._read_new_entries()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self._inode = os.stat(self.path).st_ino
+        self._offset = os.path.getsize(self.path)
+        self._lines = len(self.entries)
+        self._appended = 0
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """Process-wide ledger, loaded on first use."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = PostingLedger()
+        return _ledger
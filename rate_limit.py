@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to the same API.
+    `penalize()` pauses the whole bucket (e.g. after a 429) so that parallel
+    workers back off together instead of each sleeping on its own.
+    """
+
+    def __init__(self, rate_per_minute, capacity=1):
+        self.rate = max(float(rate_per_minute), 0.001) / 60.0
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waited = 0.0
+        self.penalties = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Blocks until a token is available. Returns the seconds spent waiting."""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    waited = now - start
+                    self.waited += waited
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(min(delay, 5.0))
+
+    def penalize(self, seconds):
+        """Pauses all acquirers for `seconds` and drains the bucket (429 backoff)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = 0
+            self.penalties += 1
@@ -0,0 +1,182 @@
+"""
+Offline replay mode: runs the pipeline without xAI, Gemini or X credentials.
+
+    AI_NEWS_REPLAY=1 python collect_ai_news.py
+
+- xAI    -> a local replay_server (fixtures from REPLAY_FIXTURES, or synthetic answers)
+- Gemini -> FakeGeminiClient (deterministic JSON built from the prompt)
+- X      -> FakeXClient (returns increasing tweet IDs)
+- git    -> skipped
+
+REPLAY_LATENCY_MS / REPLAY_JITTER_MS / REPLAY_FAULT_429 / REPLAY_FAULT_500 / REPLAY_SEED
+apply to all three fakes. Reports, indexes and the site are still written to the
+working tree, so use it on a scratch copy (benchmark.py pipeline does that for you).
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import itertools
+from types import SimpleNamespace
+
+REPLAY_ENABLED = os.environ.get("AI_NEWS_REPLAY", "") not in ("", "0")
+# Directory of recorded xAI responses; empty means synthetic answers generated per request
+REPLAY_FIXTURES = os.environ.get("REPLAY_FIXTURES", "")
+# Share of synthetic tools that have news in a given request
+REPLAY_NEWS_RATE = float(os.environ.get("REPLAY_NEWS_RATE", "0.5"))
+
+_TOOL_LINE_RE = re.compile(r'^- (.+?): (@\S.*)$', re.MULTILINE)
+
+# Calls made to the fake Gemini and X clients (xAI calls: xai_requests())
+CALLS = {"gemini": 0, "x": 0}
+_calls_lock = threading.Lock()
+_status_ids = itertools.count(1980000000000000000)
+_server = None
+_server_lock = threading.Lock()
+_faults = None
+_faults_lock = threading.Lock()
+
+
+def _count(service):
+    with _calls_lock:
+        CALLS[service] += 1
+
+
+def faults():
+    """Fault injector shared by the fakes (configured from the REPLAY_* variables)."""
+    global _faults
+    with _faults_lock:
+        if _faults is None:
+            # replay_server (http.server, ssl, ...) is only imported when replay is actually used
+            from replay_server import FaultInjector
+            _faults = FaultInjector.from_env()
+        return _faults
+
+
+def _stable_fraction(*parts):
+    digest = hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+    return int(digest[:8], 16) / 0xFFFFFFFF
+
+
+def synthetic_xai_reply(payload):
+    """Answers an x_search request (decoded JSON payload) with one entry per tool listed in its prompt."""
+    prompt = (payload or {}).get("input", [{}])[0].get("content", "")
+    date_match = re.search(r'Current Date: (\S+)', prompt)
+    post_date = f"{date_match.group(1) if date_match else '2026-01-01'} 09:00"
+
+    answer = []
+    for tool_name, accounts in _TOOL_LINE_RE.findall(prompt):
+        handle = accounts.split(",")[0].strip().lstrip("@")
+        status_id = next(_status_ids)
+        if _stable_fraction(tool_name, str(status_id)) >= REPLAY_NEWS_RATE:
+            answer.append({"tool_name": tool_name, "has_news": False, "post_text": "No recent updates",
+                           "post_date": "", "post_url": "", "why_notable": "", "source_type": "official"})
+            continue
+        answer.append({
+            "tool_name": tool_name,
+            "has_news": True,
+            "post_text": f"{tool_name} ships update #{status_id % 100000}: faster responses and a new API option for developers.",
+            "post_date": post_date,
+            "post_url": f"https://x.com/{handle}/status/{status_id}",
+            "why_notable": f"{tool_name}の開発者向け機能が強化されます。",
+            "source_type": "official",
+        })
+
+    text = json.dumps(answer, ensure_ascii=False)
+    return {"status": 200, "headers": {}, "body": {
+        "id": f"resp_replay_{len(answer)}",
+        "object": "response",
+        "output": [{"type": "message", "role": "assistant",
+                    "content": [{"type": "output_text", "text": text}]}],
+        "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4,
+                  "total_tokens": (len(prompt) + len(text)) // 4},
+    }}
+
+
+def xai_url():
+    """URL of the replay xAI server, started on first use."""
+    global _server
+    injector = faults()
+    with _server_lock:
+        if _server is None:
+            from replay_server import start_server, load_fixtures
+            if REPLAY_FIXTURES:
+                replies, responder = load_fixtures(REPLAY_FIXTURES), None
+            else:
+                replies, responder = None, synthetic_xai_reply
+            # Faults are injected on the server, so the client sees real 429/500 responses
+            _server = start_server(replies, responder=responder, faults=injector)
+        return _server.url
+
+
+def xai_requests():
+    """Number of requests the replay xAI server has answered (including injected failures)."""
+    return len(_server.requests) if _server is not None else 0
+
+
+class FakeGeminiClient:
+    """Stands in for genai.Client: client.models.generate_content(model=..., contents=...)."""
+
+    def __init__(self):
+        self.models = self
+
+    def generate_content(self, model, contents):
+        _count("gemini")
+        injector = faults()
+        injector.delay()
+        status = injector.fault()
+        if status == 429:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED (injected)")
+        if status == 500:
+            raise RuntimeError("500 INTERNAL (injected)")
+
+        if "Posts (JSON list" in contents:
+            start = contents.index("[", contents.index("Posts (JSON list"))
+            posts, _ = json.JSONDecoder().raw_decode(contents, start)
+            answer = [dict(self._verdict(p["tool_name"], p["raw_text"]), id=p["id"]) for p in posts]
+        else:
+            tool = re.search(r'about the AI tool "(.*?)"', contents)
+            text = re.search(r'"""\n(.*?)\n"""', contents, re.DOTALL)
+            answer = self._verdict(tool.group(1) if tool else "", text.group(1) if text else contents)
+        return SimpleNamespace(text=json.dumps(answer, ensure_ascii=False))
+
+    @staticmethod
+    def _verdict(tool_name, raw_text):
+        # About one post in five is judged not newsworthy
+        if _stable_fraction("gemini", raw_text) < 0.2:
+            return {"has_news": False}
+        return {
+            "summary": f"{tool_name}がアップデートを公開しました。{raw_text[:60]}",
+            "why": "開発者の作業効率が向上します。",
+            "score": min(5, 1 + int(_stable_fraction("score", raw_text) * 5)),
+            "hook": f"{tool_name}に新機能が登場",
+        }
+
+
+class FakeXClient:
+    """Stands in for tweepy.Client: create_tweet(text=...) -> response with data['id']."""
+
+    def __init__(self):
+        self.tweets = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_tweet(self, text):
+        _count("x")
+        injector = faults()
+        injector.delay()
+        status = injector.fault()
+        if status == 429:
+            # Like tweepy.TooManyRequests: the response carries the rate-limit headers
+            error = RuntimeError("429 Too Many Requests (injected)")
+            error.response = SimpleNamespace(status_code=429, headers={
+                "x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(time.time()) + 1)})
+            raise error
+        if status == 500:
+            raise RuntimeError("500 Internal Server Error (injected)")
+        with self._lock:
+            self.tweets.append(text)
+            tweet_id = str(next(self._ids))
+        return SimpleNamespace(data={"id": tweet_id})
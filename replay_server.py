@@ -0,0 +1,171 @@
+"""
+Local stub of the xAI Responses API that replays canned payloads.
+
+    python replay_server.py fixtures/xai_responses --port 8765
+    XAI_API_URL=http://127.0.0.1:8765/v1/responses python collect_ai_news.py
+
+Each fixture file is either a Responses API payload (served with 200) or a
+scripted reply {"status": 429, "headers": {"Retry-After": "1"}, "body": {...}}.
+Fixtures are served in file-name order and then cycled. Instead of fixtures, a
+`responder(request_payload) -> reply` can generate replies (see replay.py), and a
+FaultInjector can add latency and random 429/500 replies.
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES = os.path.join(BASE_DIR, "fixtures", "xai_responses")
+
+
+def load_fixtures(path=DEFAULT_FIXTURES):
+    """Loads every *.json fixture in `path` as a scripted reply dict."""
+    replies = []
+    for name in sorted(os.listdir(path)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if "status" in data and "body" in data:
+            replies.append(data)
+        else:
+            replies.append({"status": 200, "headers": {}, "body": data})
+    if not replies:
+        raise ValueError(f"No fixtures found in {path}")
+    return replies
+
+
+class FaultInjector:
+    """Adds fixed latency (+ jitter) and random 429/500 failures to replayed calls."""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, rate_429=0.0, rate_500=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.injected = {429: 0, 500: 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix="REPLAY_"):
+        env = os.environ
+        return cls(
+            latency_ms=float(env.get(f"{prefix}LATENCY_MS", "0")),
+            jitter_ms=float(env.get(f"{prefix}JITTER_MS", "0")),
+            rate_429=float(env.get(f"{prefix}FAULT_429", "0")),
+            rate_500=float(env.get(f"{prefix}FAULT_500", "0")),
+            seed=env.get(f"{prefix}SEED"),
+        )
+
+    def delay(self):
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def fault(self):
+        """Returns 429, 500 or None for the next call."""
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.rate_429:
+                status = 429
+            elif roll < self.rate_429 + self.rate_500:
+                status = 500
+            else:
+                return None
+            self.injected[status] += 1
+            return status
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, replies=None, responder=None, faults=None):
+        super().__init__(address, ReplayHandler)
+        self.replies = replies
+        self.responder = responder
+        self.faults = faults
+        self.requests = []
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def next_reply(self, request_body):
+        with self._lock:
+            self.requests.append(request_body)
+            cursor = self._cursor
+            self._cursor += 1
+        if self.faults is not None:
+            self.faults.delay()
+            status = self.faults.fault()
+            if status == 429:
+                return {"status": 429, "headers": {"Retry-After": "1"}, "body": {"error": "Too many requests (injected)"}}
+            if status == 500:
+                return {"status": 500, "headers": {}, "body": {"error": "Internal error (injected)"}}
+        if self.responder is not None:
+            return self.responder(request_body)
+        return self.replies[cursor % len(self.replies)]
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/responses"
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        try:
+            request_body = json.loads(raw or b"{}")
+        except ValueError:
+            request_body = None
+        reply = self.server.next_reply(request_body)
+        body = json.dumps(reply["body"], ensure_ascii=False).encode('utf-8')
+        self.send_response(reply["status"])
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in reply.get("headers", {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(replies=None, host="127.0.0.1", port=0, responder=None, faults=None):
+    """Starts a replay server on a background thread. Returns the server (see `.url`)."""
+    if replies is None and responder is None:
+        replies = load_fixtures()
+    server = ReplayServer((host, port), replies, responder=responder, faults=faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay canned xAI Responses API payloads")
+    parser.add_argument("fixtures", nargs="?", default=DEFAULT_FIXTURES)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # Latency / fault injection via REPLAY_LATENCY_MS, REPLAY_FAULT_429, REPLAY_FAULT_500
+    server = ReplayServer(("127.0.0.1", args.port), load_fixtures(args.fixtures), faults=FaultInjector.from_env())
+    print(f"Replaying {len(server.replies)} fixture(s) at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        sys.exit(0)
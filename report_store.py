@@ -0,0 +1,256 @@
+"""
+Storage for collected reports: one append-only JSON-lines segment per day.
+
+    reports/2026-10-18.jsonl      one compact report per line, {"id": ..., <report fields>}
+    reports/2026-01-31/*.json     legacy layout (one file per report), still read
+
+The collector, site builder, poster and dedup index all go through ReportStore.
+An offset index (.cache/report_index.json, rebuilt on demand) maps report IDs to
+byte ranges, so membership checks and lookups don't re-read whole segments.
+
+    python report_store.py stats
+    python report_store.py migrate    # fold legacy day directories into segments
+"""
+import os
+import sys
+import json
+import atexit
+import hashlib
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+INDEX_FILE = os.path.join(BASE_DIR, ".cache", "report_index.json")
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def report_id(tool_name, post_url):
+    """Stable ID of a report: tool name + hash of the post URL (the legacy file name stem)."""
+    url_hash = hashlib.md5(post_url.encode()).hexdigest()[:8]
+    return f"{tool_name.replace(' ', '_').replace('/', '-')}_{url_hash}"
+
+
+class ReportStore:
+    def __init__(self, root=REPORTS_DIR, index_path=INDEX_FILE):
+        self.root = root
+        self.index_path = index_path
+        # segment name -> {"size": indexed bytes, "ids": {id: [offset, length]}, "last": [id, offset, length]}
+        self._segments = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._load_index()
+        atexit.register(self.save_index)
+
+    # --- layout ---
+
+    def segment_path(self, day):
+        return os.path.join(self.root, f"{day}{SEGMENT_SUFFIX}")
+
+    def legacy_dir(self, day):
+        return os.path.join(self.root, day)
+
+    def days(self):
+        """Every day with reports in either layout, oldest first."""
+        found = set()
+        if os.path.isdir(self.root):
+            for entry in os.scandir(self.root):
+                if entry.is_dir():
+                    found.add(entry.name)
+                elif entry.name.endswith(SEGMENT_SUFFIX):
+                    found.add(entry.name[:-len(SEGMENT_SUFFIX)])
+        return sorted(found)
+
+    def sources(self):
+        """
+        (relative path, stat) of every file holding reports, in a stable order:
+        per day, legacy files (sorted) then the day's segment.
+        """
+        found = []
+        for day in self.days():
+            legacy = self.legacy_dir(day)
+            if os.path.isdir(legacy):
+                for entry in sorted(os.scandir(legacy), key=lambda e: e.name):
+                    if entry.name.endswith('.json') and entry.is_file():
+                        found.append((f"{day}/{entry.name}", entry.stat()))
+            segment = self.segment_path(day)
+            if os.path.exists(segment):
+                found.append((os.path.basename(segment), os.stat(segment)))
+        return found
+
+    def read_source(self, rel_path):
+        """Reports held by one source file (see sources()), as (id, report) pairs."""
+        path = os.path.join(self.root, rel_path)
+        if rel_path.endswith(SEGMENT_SUFFIX):
+            return list(_iter_segment(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            return [(os.path.splitext(os.path.basename(rel_path))[0], json.load(f))]
+
+    # --- reading ---
+
+    def iter_reports(self, days=None):
+        """Yields (day, id, report) for the given days (default: all), in sources() order."""
+        wanted = None if days is None else set(days)
+        for rel_path, _ in self.sources():
+            day = rel_path.split("/")[0].replace(SEGMENT_SUFFIX, "")
+            if wanted is not None and day not in wanted:
+                continue
+            try:
+                for rid, report in self.read_source(rel_path):
+                    yield day, rid, report
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️ Skipping {rel_path}: {e}")
+
+    def exists(self, day, rid):
+        if os.path.exists(os.path.join(self.legacy_dir(day), f"{rid}.json")):
+            return True
+        with self._lock:
+            return rid in self._refresh(day)["ids"]
+
+    def get(self, day, rid):
+        """One report by ID (None if absent), read with a single seek."""
+        legacy = os.path.join(self.legacy_dir(day), f"{rid}.json")
+        if os.path.exists(legacy):
+            with open(legacy, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        with self._lock:
+            span = self._refresh(day)["ids"].get(rid)
+        if span is None:
+            return None
+        with open(self.segment_path(day), 'rb') as f:
+            f.seek(span[0])
+            report = json.loads(f.read(span[1]))
+        report.pop("id", None)
+        return report
+
+    # --- writing ---
+
+    def append(self, day, rid, report):
+        """Appends a report to the day's segment. Returns False if the ID is already stored."""
+        with self._lock:
+            if self.exists(day, rid):
+                return False
+            self._write(day, rid, report)
+        return True
+
+    def _write(self, day, rid, report):
+        line = (json.dumps({"id": rid, **report}, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._lock:
+            segment = self._refresh(day)
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.segment_path(day), 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(line)
+            segment["ids"][rid] = [offset, len(line)]
+            segment["last"] = [rid, offset, len(line)]
+            segment["size"] = offset + len(line)
+            self._dirty = True
+
+    # --- offset index ---
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._segments = json.load(f).get("segments", {})
+        except (OSError, ValueError):
+            self._segments = {}
+
+    def _refresh(self, day):
+        """Index entry for a day's segment, after indexing any lines appended since last time."""
+        name = f"{day}{SEGMENT_SUFFIX}"
+        segment = self._segments.setdefault(name, {"size": 0, "ids": {}, "last": None})
+        path = self.segment_path(day)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < segment["size"] or not _still_indexed(path, segment):
+            # Rewritten (e.g. by migrate or a git rebase): start over
+            segment.update(size=0, ids={}, last=None)
+        if size > segment["size"]:
+            with open(path, 'rb') as f:
+                f.seek(segment["size"])
+                offset = segment["size"]
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Partially written line
+                    try:
+                        rid = json.loads(raw)["id"]
+                        segment["ids"][rid] = [offset, len(raw)]
+                        segment["last"] = [rid, offset, len(raw)]
+                    except (ValueError, KeyError):
+                        pass
+                    offset += len(raw)
+            segment["size"] = offset
+            self._dirty = True
+        return segment
+
+    def save_index(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"segments": self._segments}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+
+
+def _still_indexed(path, segment):
+    """True if the last indexed line is still where the index says it is."""
+    if not segment.get("last"):
+        return True
+    rid, offset, length = segment["last"]
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length)).get("id") == rid
+    except (OSError, ValueError):
+        return False
+
+
+def _iter_segment(path):
+    with open(path, 'rb') as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                report = json.loads(raw)
+            except ValueError:
+                continue
+            yield report.pop("id", None), report
+
+
+def migrate(store):
+    """Folds every legacy day directory into that day's segment. Returns the number of reports moved."""
+    moved = 0
+    for day in store.days():
+        legacy = store.legacy_dir(day)
+        if not os.path.isdir(legacy):
+            continue
+        names = sorted(n for n in os.listdir(legacy) if n.endswith('.json'))
+        for name in names:
+            path = os.path.join(legacy, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            rid = os.path.splitext(name)[0]
+            # Written to the segment before the file is removed, so an interrupted run loses nothing
+            with store._lock:
+                if rid not in store._refresh(day)["ids"]:
+                    store._write(day, rid, report)
+            os.remove(path)
+            moved += 1
+        if not os.listdir(legacy):
+            os.rmdir(legacy)
+        print(f"  {day}: {len(names)} report(s) -> {os.path.basename(store.segment_path(day))}")
+    store.save_index()
+    return moved
+
+
+if __name__ == "__main__":
+    store = ReportStore()
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        print(f"Migrated {migrate(store)} legacy report(s) into daily segments.")
+    else:
+        sources = store.sources()
+        segments = [s for s, _ in sources if s.endswith(SEGMENT_SUFFIX)]
+        reports = sum(1 for _ in store.iter_reports())
+        print(f"{reports} report(s) in {len(store.days())} day(s): "
+              f"{len(segments)} segment(s), {len(sources) - len(segments)} legacy file(s).")
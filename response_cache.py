@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def cache_key(*parts):
+    """Content address for a request: SHA-256 over its JSON-encoded inputs."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for API responses, persisted to a JSON file.
+    Concurrent requests for the same key are coalesced: one caller computes,
+    the others wait for its result.
+    """
+
+    def __init__(self, path, ttl_sec, max_entries, save_every=20):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._unsaved = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._load()
+        atexit.register(self.save)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in stored.items():
+            if now - entry.get("at", 0) < self.ttl_sec:
+                self.entries[key] = entry
+
+    def _fresh(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["at"] >= self.ttl_sec:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def begin(self, key):
+        """
+        Starts a lookup whose value the caller may compute itself. Returns one of
+        ("hit", value), ("owner", None): compute it and call finish(key, value), or
+        ("wait", waiter): another caller is computing it, pass the waiter to wait().
+        """
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return "hit", entry["value"]
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                self._inflight[key] = {"event": threading.Event(), "value": None}
+                self.misses += 1
+                return "owner", None
+            self.coalesced += 1
+            return "wait", waiter
+
+    def finish(self, key, value, cacheable=lambda value: True):
+        """Publishes the owner's value (None if computing it failed) to waiting callers."""
+        with self._lock:
+            waiter = self._inflight.pop(key)
+            waiter["value"] = value
+            if value is not None and cacheable(value):
+                self._put_locked(key, value)
+        waiter["event"].set()
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    @staticmethod
+    def wait(waiter):
+        waiter["event"].wait()
+        return waiter["value"]
+
+    def get_or_compute(self, key, compute, cacheable=lambda value: True):
+        """Returns the cached value for `key`, or computes it once for all concurrent callers."""
+        state, value = self.begin(key)
+        if state == "hit":
+            return value
+        if state == "wait":
+            return self.wait(value)
+        value = None
+        try:
+            value = compute()
+        finally:
+            self.finish(key, value, cacheable)
+        return value
+
+    def _put_locked(self, key, value):
+        self.entries[key] = {"value": value, "at": time.time()}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self._unsaved += 1
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                snapshot = dict(self.entries)
+                self._unsaved = 0
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,181 @@
+"""
+Post-build asset stage for docs/.
+
+- Generated HTML is minified while it is written (whitespace runs that contain a
+  line break collapse to one line break, which renders the same).
+- docs/styles.css stays the hand-edited source. Pages reference a minified copy
+  whose name carries its content hash (styles.<hash>.css), so browsers and CDNs
+  can cache it indefinitely.
+- Text assets get precompressed .gz siblings, plus .br when the brotli module is
+  installed. They are written only when the source file is newer than its sibling.
+
+ASSET_MINIFY=0 / ASSET_PRECOMPRESS=0 turn the steps off.
+"""
+import os
+import re
+import gzip
+import glob
+import hashlib
+from functools import lru_cache
+from build_cache import write_if_changed
+
+try:
+    import brotli
+except ImportError:  # Optional: .br siblings are skipped without it
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(BASE_DIR, "docs")
+STYLESHEET_SOURCE = os.path.join(DOCS_DIR, "styles.css")
+ASSET_MINIFY = os.environ.get("ASSET_MINIFY", "1") != "0"
+ASSET_PRECOMPRESS = os.environ.get("ASSET_PRECOMPRESS", "1") != "0"
+COMPRESSED_SUFFIXES = (".html", ".css", ".js", ".json", ".xml")
+# Smaller files gain nothing from a compressed sibling
+MIN_COMPRESS_BYTES = 1024
+
+_HTML_SPACE_RE = re.compile(r'[ \t\r]*\n\s*')
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+_FINGERPRINT_RE = re.compile(r'^styles\.[0-9a-f]{10}\.css$')
+
+# Page name -> (bytes before, bytes after) for pages minified during this run
+MINIFIED = {}
+
+
+def minify_html(text):
+    return _HTML_SPACE_RE.sub('\n', text)
+
+
+def minify_html_stream(name, fragments):
+    """Minifies streamed page fragments, recording the page's sizes in MINIFIED."""
+    if not ASSET_MINIFY:
+        yield from fragments
+        return
+    before = after = 0
+    first = True
+    for fragment in fragments:
+        out = minify_html(fragment)
+        if first:
+            out = out.lstrip()
+            first = False
+        before += len(fragment.encode('utf-8'))
+        after += len(out.encode('utf-8'))
+        yield out
+    MINIFIED[name] = (before, after)
+
+
+def minify_css(text):
+    text = _CSS_COMMENT_RE.sub('', text)
+    text = _CSS_SPACE_RE.sub(' ', text)
+    text = _CSS_PUNCT_RE.sub(r'\1', text)
+    text = _CSS_COLON_RE.sub(':', text)
+    return text.replace(';}', '}').strip() + "\n"
+
+
+@lru_cache(maxsize=4)
+def _stylesheet(path, mtime_ns, size):
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    css = minify_css(source) if ASSET_MINIFY else source
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    return f"styles.{digest}.css", css
+
+
+def stylesheet(path=STYLESHEET_SOURCE):
+    """(fingerprinted file name, its CSS) for the current docs/styles.css."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "styles.css", None
+    return _stylesheet(path, stat.st_mtime_ns, stat.st_size)
+
+
+def stylesheet_name():
+    """File name pages should link to."""
+    return stylesheet()[0]
+
+
+def publish_stylesheet(docs_dir=DOCS_DIR):
+    """Writes the fingerprinted stylesheet and removes older fingerprints. Returns its file name."""
+    name, css = stylesheet(os.path.join(docs_dir, "styles.css"))
+    if css is None:
+        return name
+    write_if_changed(os.path.join(docs_dir, name), css)
+    for path in glob.glob(os.path.join(docs_dir, "styles.*.css")):
+        base = os.path.basename(path)
+        if base != name and _FINGERPRINT_RE.match(base):
+            os.remove(path)
+    return name
+
+
+def _write_sibling(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def precompress(docs_dir=DOCS_DIR):
+    """
+    Writes .gz (and .br) siblings for text assets that changed since their sibling was written,
+    and removes siblings whose source is gone. Returns {relative path: (size, gz size, br size)}.
+    """
+    sizes = {}
+    if not ASSET_PRECOMPRESS:
+        return sizes
+    suffixes = (".gz", ".br") if brotli is not None else (".gz",)
+    for root, _, files in os.walk(docs_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith((".gz", ".br")):
+                if not os.path.exists(path[:-3]):
+                    os.remove(path)
+                continue
+            if not name.endswith(COMPRESSED_SUFFIXES) or name == "styles.css":
+                continue
+            source_stat = os.stat(path)
+            if source_stat.st_size < MIN_COMPRESS_BYTES:
+                continue
+            data = None
+            for suffix in suffixes:
+                sibling = path + suffix
+                if os.path.exists(sibling) and os.stat(sibling).st_mtime_ns >= source_stat.st_mtime_ns:
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                # mtime=0 keeps the .gz bytes identical for identical input
+                packed = gzip.compress(data, 9, mtime=0) if suffix == ".gz" else brotli.compress(data)
+                _write_sibling(sibling, packed)
+            rel_path = os.path.relpath(path, docs_dir).replace(os.sep, '/')
+            sizes[rel_path] = (
+                source_stat.st_size,
+                os.path.getsize(path + ".gz"),
+                os.path.getsize(path + ".br") if brotli is not None else None,
+            )
+    return sizes
+
+
+def _size(n):
+    return f"{n:,}" if n is not None else "-"
+
+
+def print_report(sizes):
+    """Bytes saved per page rendered this run (minify + compression), then totals for docs/."""
+    if MINIFIED:
+        print(f"  {'page':<28} {'raw':>9} {'minified':>9} {'gzip':>9} {'brotli':>9} {'saved':>6}")
+    for name, (before, after) in sorted(MINIFIED.items()):
+        _, gz, br = sizes.get(name, (after, None, None))
+        wire = min(s for s in (after, gz, br) if s is not None)
+        saved = 1 - wire / before if before else 0
+        print(f"  {name:<28} {_size(before):>9} {_size(after):>9} {_size(gz):>9} {_size(br):>9} {saved:>6.0%}")
+    if sizes:
+        total = sum(s for s, _, _ in sizes.values())
+        total_gz = sum(gz for _, gz, _ in sizes.values())
+        brotli_note = (f", {sum(br for _, _, br in sizes.values()):,} brotli" if brotli is not None else
+                       " (brotli not installed: no .br files)")
+        print(f"  📦 Assets: {len(sizes)} file(s), {total:,} bytes -> {total_gz:,} gzip{brotli_note}")
+    # A long-running process (collector_daemon) builds many times
+    MINIFIED.clear()
@@ -0,0 +1,194 @@
+"""
+Atom and JSON Feed outputs for the static site (served from docs/feeds/).
+
+    docs/feeds/all.xml / all.json                    every tool
+    docs/feeds/category/<slug>.xml / .json            one per category in targets.json
+    docs/feeds/tool/<slug>.xml / .json                one per tool in targets.json
+    docs/feeds/index.json                             every feed with its content hash
+
+Each feed holds the newest FEED_LIMIT items. Its bytes depend only on those
+items: <updated> is the newest item's time, not the build time. Unchanged feeds
+therefore keep their ETag, and pollers can compare the hashes in index.json
+instead of downloading the feeds. A feed whose inputs hash the same as last time
+is not rendered again.
+"""
+import os
+import re
+import json
+import html
+import hashlib
+from build_cache import content_hash, write_if_changed
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCS_DIR = os.path.join(BASE_DIR, "docs")
+SITE_URL = os.environ.get("SITE_URL", "https://tadfuji.github.io/AI_TOOL_NEWS/")
+# Items per feed (newest first)
+FEED_LIMIT = int(os.environ.get("FEED_LIMIT", "50"))
+# Bump when the feed markup changes (every feed is rendered again)
+FEED_VERSION = 2
+
+SITE_TITLE = "AI TOOL NEWS"
+_SORT_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2})$')
+_CATEGORY_NUMBER_RE = re.compile(r'^\d+\.\s*')
+
+
+# xml.sax.saxutils would pull in urllib.request / http.client (~30ms of every build's startup)
+def escape(text):
+    return html.escape(text, quote=False)
+
+
+def quoteattr(value):
+    return f'"{html.escape(value)}"'
+
+
+def category_label(name):
+    """Category name without its ordering prefix ("1. Top Tier" -> "Top Tier")."""
+    return _CATEGORY_NUMBER_RE.sub('', name)
+
+
+def slugify(name):
+    """File-name slug: "1. Top Tier" -> "top-tier", "Leonardo.ai" -> "leonardo-ai"."""
+    slug = re.sub(r'[^a-z0-9]+', '-', category_label(name).lower()).strip('-')
+    return slug or hashlib.md5(name.encode('utf-8')).hexdigest()[:8]
+
+
+def item_timestamp(item):
+    """RFC 3339 time of an item (JST); items without a parsed time use midnight of their date."""
+    match = _SORT_DATE_RE.match(item.get('sort_date', ''))
+    if match:
+        return f"{match.group(1)}T{match.group(2)}:00+09:00"
+    return f"{item['date']}T00:00:00+09:00"
+
+
+def entry_id(item):
+    """The post URL; entries without one get a tag URI derived from their content."""
+    if item['url'].startswith("http"):
+        return item['url']
+    digest = hashlib.md5(f"{item['tool']}|{item['date']}|{item['summary']}".encode('utf-8')).hexdigest()[:16]
+    return f"tag:tadfuji.github.io,2026:{digest}"
+
+
+def item_title(item, limit=80):
+    summary = item['summary']
+    return f"{item['tool']}: {summary[:limit] + '…' if len(summary) > limit else summary}"
+
+
+def render_atom(feed, items):
+    entries = []
+    for item in items:
+        ref = (f'\n    <link rel="related" href={quoteattr(item["ref_url"])}/>' if item.get('ref_url') else "")
+        content = f"<p>{escape(item['summary'])}</p><p>{escape(item['why'])}</p>"
+        entries.append(f"""  <entry>
+    <id>{escape(entry_id(item))}</id>
+    <title>{escape(item_title(item))}</title>
+    <link rel="alternate" href={quoteattr(item['url'])}/>{ref}
+    <updated>{item_timestamp(item)}</updated>
+    <author><name>{escape(item['tool'])}</name></author>
+    <category term={quoteattr(category_label(item['category']))}/>
+    <content type="html">{escape(content)}</content>
+  </entry>
+""")
+    updated = item_timestamp(items[0]) if items else "1970-01-01T00:00:00Z"
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="ja">
+  <id>{escape(SITE_URL + feed['atom'])}</id>
+  <title>{escape(feed['title'])}</title>
+  <link rel="self" type="application/atom+xml" href={quoteattr(SITE_URL + feed['atom'])}/>
+  <link rel="alternate" type="text/html" href={quoteattr(SITE_URL)}/>
+  <updated>{updated}</updated>
+{"".join(entries)}</feed>
+"""
+
+
+def render_json_feed(feed, items):
+    entries = []
+    for item in items:
+        entry = {
+            "id": entry_id(item),
+            "url": item['url'],
+            "title": item_title(item),
+            "content_text": f"{item['summary']}\n\n{item['why']}",
+            "date_published": item_timestamp(item),
+            "authors": [{"name": item['tool']}],
+            "tags": [category_label(item['category']), item['tool']],
+        }
+        if item.get('ref_url'):
+            entry["external_url"] = item['ref_url']
+        entries.append(entry)
+    return json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": feed['title'],
+        "home_page_url": SITE_URL,
+        "feed_url": SITE_URL + feed['json'],
+        "language": "ja",
+        "items": entries,
+    }, ensure_ascii=False, indent=1) + "\n"
+
+
+def plan_feeds(items, targets, limit=FEED_LIMIT):
+    """
+    The feeds to write, each with its newest `limit` items. `items` are unique items
+    newest first (build_site.unique_items); `targets` is the raw targets.json list.
+    """
+    dated = [item for item in items if item['date'] != 'Unknown Date']
+
+    def feed(kind, name, title, wanted):
+        path = "all" if kind == "all" else f"{kind}/{slugify(name)}"
+        return {"kind": kind, "name": name, "title": title,
+                "atom": f"feeds/{path}.xml", "json": f"feeds/{path}.json",
+                "items": [item for item in dated if wanted(item)][:limit]}
+
+    feeds = [feed("all", None, SITE_TITLE, lambda item: True)]
+    for category in targets:
+        cat_name = category.get('category', '')
+        tools = {tool['name'] for tool in category.get('tools', [])}
+        feeds.append(feed("category", cat_name, f"{SITE_TITLE} - {category_label(cat_name)}",
+                          lambda item, cat_name=cat_name, tools=tools: item['category'] == cat_name or item['tool'] in tools))
+        for tool in sorted(tools):
+            feeds.append(feed("tool", tool, f"{SITE_TITLE} - {tool}", lambda item, tool=tool: item['tool'] == tool))
+    return feeds
+
+
+def update_feeds(items, targets, docs_dir=DOCS_DIR, limit=FEED_LIMIT):
+    """Writes every planned feed whose inputs changed, removes feeds no longer planned, updates index.json."""
+    manifest_path = os.path.join(docs_dir, "feeds", "index.json")
+    previous = {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("v") == FEED_VERSION:
+            previous = {entry["atom"]: entry for entry in manifest["feeds"]}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    entries = []
+    rendered = unchanged = 0
+    for feed in plan_feeds(items, targets, limit):
+        digest = content_hash(FEED_VERSION, SITE_URL, feed['title'], feed['atom'], feed['items'])[:16]
+        atom_path = os.path.join(docs_dir, feed['atom'])
+        json_path = os.path.join(docs_dir, feed['json'])
+        if (previous.get(feed['atom'], {}).get("hash") == digest
+                and os.path.exists(atom_path) and os.path.exists(json_path)):
+            unchanged += 1
+        else:
+            os.makedirs(os.path.dirname(atom_path), exist_ok=True)
+            write_if_changed(atom_path, render_atom(feed, feed['items']))
+            write_if_changed(json_path, render_json_feed(feed, feed['items']))
+            rendered += 1
+        entries.append({
+            "kind": feed['kind'], "name": feed['name'], "title": feed['title'],
+            "atom": feed['atom'], "json": feed['json'], "items": len(feed['items']),
+            "updated": item_timestamp(feed['items'][0]) if feed['items'] else None,
+            "hash": digest,
+        })
+
+    live = {entry["atom"] for entry in entries}
+    for atom in set(previous) - live:
+        for rel_path in (atom, previous[atom].get("json", "")):
+            path = os.path.join(docs_dir, rel_path)
+            if rel_path and os.path.exists(path):
+                os.remove(path)
+
+    write_if_changed(manifest_path, json.dumps({"v": FEED_VERSION, "limit": limit, "feeds": entries},
+                                               ensure_ascii=False, indent=1) + "\n")
+    print(f"  📡 Feeds: {len(entries)} feed(s) — {rendered} rendered, {unchanged} unchanged")
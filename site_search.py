@@ -0,0 +1,136 @@
+"""
+Prebuilt full-text search index for the static site (served from docs/search/).
+
+    docs/search/index.json      shard list, newest month first
+    docs/search/2026-01.json    one shard per month: its cards plus an inverted index
+
+Terms are ASCII words plus, for Japanese, character bigrams (see tokenize();
+docs/search.js applies the same rules to the query). Tool, category, summary and
+why are indexed.
+
+Shards are updated incrementally. A month whose cards are unchanged is not
+touched. New cards of a month are tokenized and appended to its shard. A shard is
+rebuilt only when existing cards changed or moved.
+"""
+import os
+import re
+import json
+import unicodedata
+from build_cache import content_hash, write_if_changed
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH_DIR = os.path.join(BASE_DIR, "docs", "search")
+# Bump when the shard format or the tokenizer changes (every shard is rebuilt)
+INDEX_VERSION = 1
+
+# Columns of a shard's "docs" rows
+FIELDS = ["tool", "category", "date", "display_date", "summary", "why", "url", "page", "score"]
+SEARCHED_FIELDS = ("tool", "category", "summary", "why")
+_SEARCHED_COLUMNS = [FIELDS.index(f) for f in SEARCHED_FIELDS]
+
+# ASCII words, or runs of kana / kanji (split into bigrams)
+_TERM_RE = re.compile(r'[a-z0-9]+|[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]+')
+
+
+def tokenize(text):
+    """Search terms of a text: lowercased ASCII words and CJK character bigrams (a lone character stays as is)."""
+    terms = []
+    for run in _TERM_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if run.isascii() or len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def doc_row(item, page_file):
+    return [item['tool'], item['category'], item['date'], item['display_date'],
+            item['summary'], item['why'], item['url'], page_file, item.get('score', 3)]
+
+
+def month_rows(pages):
+    """A month's rows, oldest first (so new cards are appended), from plan_archive_pages() output."""
+    rows = []
+    for page in reversed(pages):
+        rows.extend(doc_row(item, page['file']) for item in reversed(page['items']))
+    return rows
+
+
+def _index_rows(terms, rows, first_id):
+    for doc_id, row in enumerate(rows, first_id):
+        for term in sorted(set(t for col in _SEARCHED_COLUMNS for t in tokenize(str(row[col])))):
+            terms.setdefault(term, []).append(doc_id)
+
+
+def _load_shard(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            shard = json.load(f)
+        return shard if shard.get("v") == INDEX_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def update_shard(path, month, rows):
+    """
+    Brings one month's shard up to date. Returns the number of rows tokenized and
+    whether the shard was rebuilt rather than appended to.
+    """
+    shard = _load_shard(path)
+    if shard and shard["docs"] == rows[:len(shard["docs"])]:
+        known = len(shard["docs"])
+        terms, rebuilt = shard["terms"], False
+    else:
+        known, terms, rebuilt = 0, {}, True
+    _index_rows(terms, rows[known:], known)
+
+    shard = {"v": INDEX_VERSION, "month": month, "docs": rows,
+             "terms": {term: terms[term] for term in sorted(terms)}}
+    # Compact, key-sorted JSON: stable bytes and a good gzip ratio
+    write_if_changed(path, json.dumps(shard, ensure_ascii=False, separators=(',', ':')))
+    return len(rows) - known, rebuilt
+
+
+def update_search_index(month_pages, search_dir=SEARCH_DIR):
+    """
+    Updates the shards for {month: pages} (pages as planned by build_site.plan_archive_pages)
+    and writes index.json. Shards of months that no longer exist are removed.
+    """
+    os.makedirs(search_dir, exist_ok=True)
+    manifest_path = os.path.join(search_dir, "index.json")
+    previous = {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("v") == INDEX_VERSION:
+            previous = {s["month"]: s for s in manifest["shards"]}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    shards = []
+    unchanged = appended = rebuilt = tokenized = 0
+    for month in sorted(month_pages, reverse=True):
+        rows = month_rows(month_pages[month])
+        digest = content_hash(INDEX_VERSION, rows)[:16]
+        filename = f"{month}.json"
+        path = os.path.join(search_dir, filename)
+        if previous.get(month, {}).get("hash") == digest and os.path.exists(path):
+            unchanged += 1
+        else:
+            count, was_rebuilt = update_shard(path, month, rows)
+            tokenized += count
+            if was_rebuilt:
+                rebuilt += 1
+            else:
+                appended += 1
+        shards.append({"month": month, "file": filename, "docs": len(rows), "hash": digest})
+
+    for month in set(previous) - set(month_pages):
+        stale = os.path.join(search_dir, f"{month}.json")
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    write_if_changed(manifest_path, json.dumps({"v": INDEX_VERSION, "fields": FIELDS, "shards": shards},
+                                               ensure_ascii=False, indent=1) + "\n")
+    print(f"  🔎 Search index: {len(shards)} shard(s) — {unchanged} unchanged, {appended} appended, "
+          f"{rebuilt} rebuilt ({tokenized} card(s) tokenized)")
@@ -0,0 +1,175 @@
+"""
+Lightweight spans, counters and token accounting for one pipeline run.
+
+    with tracing.span("git.push"):
+        ...
+
+    @tracing.traced("gemini.filter_batch")
+    def filter_x_updates_batch(...): ...
+
+At the end of a run, write_run_report() appends one JSON line to
+.cache/run_reports.jsonl (RUN_REPORT_FILE) and print_summary() prints a table.
+"""
+import os
+import json
+import time
+import random
+import datetime
+import functools
+import threading
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUN_REPORT_FILE = os.environ.get("RUN_REPORT_FILE", os.path.join(BASE_DIR, ".cache", "run_reports.jsonl"))
+# Durations kept per span for percentiles; count/total/max are exact regardless
+SPAN_SAMPLES = 1024
+
+
+class SpanStats:
+    """Count, total and max of a span's durations plus a fixed-size uniform sample (reservoir) for percentiles."""
+
+    def __init__(self, size=SPAN_SAMPLES):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self._random = random.Random(0)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = seconds
+
+    def percentile(self, q):
+        values = sorted(self.samples)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Tracer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        self.spans = {}
+        self.errors = {}
+        self.counters = {}
+        self.tokens = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def record_span(self, name, seconds, error=False):
+        with self._lock:
+            if name not in self.spans:
+                self.spans[name] = SpanStats()
+            self.spans[name].add(seconds)
+            if error:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_tokens(self, service, input_tokens=0, output_tokens=0):
+        with self._lock:
+            usage = self.tokens.setdefault(service, {"input": 0, "output": 0})
+            usage["input"] += input_tokens or 0
+            usage["output"] += output_tokens or 0
+
+    def gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def snapshot(self):
+        """The run report: per-span count/total/percentiles plus counters, tokens and gauges."""
+        with self._lock:
+            spans = {}
+            for name, stats in self.spans.items():
+                spans[name] = {
+                    "count": stats.count,
+                    "errors": self.errors.get(name, 0),
+                    "total_s": round(stats.total, 4),
+                    "p50_s": round(stats.percentile(0.5), 4),
+                    "p90_s": round(stats.percentile(0.9), 4),
+                    "max_s": round(stats.max, 4),
+                }
+            return {
+                "started_at": self.started_at,
+                "wall_s": round(time.perf_counter() - self.started, 3),
+                "spans": spans,
+                "counters": dict(self.counters),
+                "tokens": {k: dict(v) for k, v in self.tokens.items()},
+                "gauges": dict(self.gauges),
+            }
+
+
+TRACER = Tracer()
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block under `name` (marked as an error if it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        TRACER.record_span(name, time.perf_counter() - start, error=True)
+        raise
+    TRACER.record_span(name, time.perf_counter() - start)
+
+
+def traced(name):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    TRACER.count(name, n)
+
+
+def add_tokens(service, input_tokens=0, output_tokens=0):
+    TRACER.add_tokens(service, input_tokens, output_tokens)
+
+
+def gauge(name, value):
+    TRACER.gauge(name, value)
+
+
+def write_run_report(path=RUN_REPORT_FILE, **extra):
+    """Appends this run's report as one JSON line. Returns the report."""
+    report = TRACER.snapshot()
+    report.update(extra)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write run report: {e}")
+    return report
+
+
+def print_summary(report=None):
+    report = report or TRACER.snapshot()
+    print(f"\n📈 Run summary ({report['wall_s']:.1f}s wall)")
+    if report["spans"]:
+        print(f"  {'stage':<22} {'calls':>6} {'errors':>6} {'total (s)':>10} {'p50 (s)':>8} {'p90 (s)':>8} {'max (s)':>8}")
+        for name, s in sorted(report["spans"].items()):
+            print(f"  {name:<22} {s['count']:>6} {s['errors']:>6} {s['total_s']:>10.2f} "
+                  f"{s['p50_s']:>8.2f} {s['p90_s']:>8.2f} {s['max_s']:>8.2f}")
+    for service, usage in sorted(report["tokens"].items()):
+        print(f"  tokens {service}: {usage['input']} in / {usage['output']} out")
+    for name, value in sorted(report["counters"].items()):
+        print(f"  {name}: {value}")
+    for name, value in sorted(report["gauges"].items()):
+        print(f"  {name}: {value:.0%}" if isinstance(value, float) and name.endswith("hit_rate") else f"  {name}: {value}")
@@ -0,0 +1,247 @@
+"""
+Reusable client for the xAI Responses API.
+
+- One pooled requests.Session (keep-alive) shared by every collector thread
+- Exponential backoff with full jitter that honors Retry-After
+- A circuit breaker that fails fast after repeated failures
+- Per-request latency split into connect / server / parse time
+
+Set XAI_API_URL to point it at a local stub server (see replay_server.py).
+"""
+import os
+import json
+import time
+import random
+import threading
+import email.utils
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+import tracing
+
+DEFAULT_API_URL = "https://api.x.ai/v1/responses"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LATENCY_FIELDS = ("connect_s", "server_s", "download_s", "parse_s", "total_s")
+
+# Connect time of the current request, accumulated by the timed connection classes
+_timing = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect = getattr(_timing, "connect", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # Includes the TLS handshake
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect = getattr(_timing, "connect", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections record how long connect() took."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class XAIError(Exception):
+    """Raised when a request cannot be completed (after retries, or with the circuit open)."""
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(when.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_output_text(data):
+    """Returns the text of the first 'message' output of a Responses API payload ('' if none)."""
+    for output_item in data.get('output', []):
+        if isinstance(output_item, dict) and output_item.get('type') == 'message':
+            for content_item in output_item.get('content', []):
+                if isinstance(content_item, dict) and content_item.get('type') == 'output_text':
+                    text = content_item.get('text', '')
+                    if text:
+                        return text
+    return ""
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failed requests; lets one trial through after `cooldown`."""
+
+    def __init__(self, threshold=3, cooldown=120.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # Half-open: the next result decides
+                self.opened_at = None
+                self.failures = self.threshold - 1
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.failures >= self.threshold and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                self.trips += 1
+
+
+class XAIClient:
+    def __init__(self, api_key, api_url=None, bucket=None, timeout=180, max_attempts=3,
+                 backoff_base=2.0, backoff_cap=60.0, pool_size=10, breaker=None):
+        self.api_url = api_url or os.environ.get("XAI_API_URL", DEFAULT_API_URL)
+        self.bucket = bucket
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = _TimedAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        })
+        # Running totals only, so a long-lived client (the daemon) stays the same size
+        self.requests = 0
+        self.reused_connections = 0
+        self.latency = {field: {"sum": 0.0, "max": 0.0} for field in LATENCY_FIELDS}
+        self.retries = 0
+        self._metrics_lock = threading.Lock()
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Retry-After when the server sent one, else full-jitter exponential backoff."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def create_response(self, payload):
+        """POSTs one Responses API request. Returns the decoded JSON payload or raises XAIError."""
+        if not self.breaker.allow():
+            tracing.count("xai.circuit_open")
+            raise XAIError("Circuit open: too many consecutive xAI failures")
+
+        body = json.dumps(payload)
+        last_error = "no attempt made"
+        for attempt in range(self.max_attempts):
+            if self.bucket is not None:
+                self.bucket.acquire()
+            _timing.connect = 0.0
+            start = time.perf_counter()
+            try:
+                with tracing.span("xai.request"):
+                    response = self.session.post(self.api_url, data=body, timeout=self.timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                last_error = f"{type(e).__name__} (attempt {attempt + 1}/{self.max_attempts})"
+                if attempt + 1 < self.max_attempts:
+                    print(f"    ⚠️ {last_error}, retrying...")
+                    self._retry_wait(attempt, None, rate_limited=False)
+                continue
+
+            received = time.perf_counter()
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    self.breaker.record(False)
+                    raise XAIError(f"Invalid JSON body: {e}")
+                parsed = time.perf_counter()
+                self._record_metrics(response, start, received, parsed)
+                usage = data.get("usage") or {}
+                tracing.add_tokens("xai", usage.get("input_tokens"), usage.get("output_tokens"))
+                self.breaker.record(True)
+                return data
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code in RETRY_STATUSES and attempt + 1 < self.max_attempts:
+                print(f"    ⚠️ {response.status_code} from xAI (attempt {attempt + 1}/{self.max_attempts}), backing off...")
+                self._retry_wait(attempt, retry_after, rate_limited=response.status_code == 429)
+                last_error = f"{response.status_code} - {response.text[:200]}"
+                continue
+
+            self.breaker.record(False)
+            raise XAIError(f"{response.status_code} - {response.text[:500]}")
+
+        self.breaker.record(False)
+        raise XAIError(f"Failed after {self.max_attempts} attempts: {last_error}")
+
+    def _retry_wait(self, attempt, retry_after, rate_limited):
+        self.retries += 1
+        tracing.count("xai.retries")
+        delay = self.backoff_delay(attempt, retry_after)
+        if rate_limited and self.bucket is not None:
+            # A 429 pauses every worker sharing the bucket, not just this one
+            self.bucket.penalize(delay)
+        else:
+            time.sleep(delay)
+
+    def _record_metrics(self, response, start, received, parsed):
+        total_to_headers = response.elapsed.total_seconds()
+        connect = getattr(_timing, "connect", 0.0)
+        entry = {
+            "connect_s": connect,
+            "server_s": max(total_to_headers - connect, 0.0),
+            "download_s": max((received - start) - total_to_headers, 0.0),
+            "parse_s": parsed - received,
+            "total_s": parsed - start,
+        }
+        with self._metrics_lock:
+            self.requests += 1
+            self.reused_connections += connect == 0.0
+            for field, seconds in entry.items():
+                stats = self.latency[field]
+                stats["sum"] += seconds
+                stats["max"] = max(stats["max"], seconds)
+
+    def latency_summary(self):
+        """Aggregated latency split over the successful requests of this client."""
+        with self._metrics_lock:
+            if not self.requests:
+                return {"requests": 0}
+            summary = {"requests": self.requests, "retries": self.retries, "breaker_trips": self.breaker.trips,
+                       "reused_connections": self.reused_connections}
+            for field, stats in self.latency.items():
+                summary[field] = {"avg": stats["sum"] / self.requests, "max": stats["max"]}
+        return summary